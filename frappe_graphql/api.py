@@ -1,32 +1,50 @@
-from graphql import GraphQLError, validate, parse
+from graphql import GraphQLError, DocumentNode
 from typing import List
 
 import frappe
-from frappe.utils import cint, strip_html_tags
+from frappe.utils import strip_html_tags
 from . import get_schema
-from .graphql import execute
-from .utils.depth_limit_validator import depth_limit_validator
+from .graphql import execute_plan
+from .utils.execution import get_execution_plan
+from .utils.execution.persisted_operations import is_persisted_operations_only
+from .utils.persisted_queries import PersistedQueryError, PersistedOperationNotAllowed, \
+    resolve_persisted_query
 
 from .utils.http import get_masked_variables, get_operation_name
 
 
 @frappe.whitelist(allow_guest=True)
 def execute_gql_query():
-    query, variables, operation_name = get_query()
-    validation_errors = validate(
-        schema=get_schema(),
-        document_ast=parse(query),
-        rules=(
-            depth_limit_validator(
-                max_depth=cint(frappe.local.conf.get("frappe_graphql_depth_limit")) or 10
-            ),
+    try:
+        query, variables, operation_name = get_query()
+        if not isinstance(query, str):
+            frappe.clear_messages()
+            frappe.local.response = frappe._dict(
+                errors=[GraphQLError("Must provide query string").formatted],
+                http_status_code=400
+            )
+            return
+
+        # The query is parsed & validated only once, or never for repeat operations.
+        # The same DocumentNode is shared across execution & error logging
+        plan = get_execution_plan(schema=get_schema(), query=query)
+        if is_persisted_operations_only() and not plan.persisted:
+            raise PersistedOperationNotAllowed()
+    except PersistedQueryError as e:
+        # Expected as part of the APQ protocol (client retries with the full query)
+        # or when the operation is not in the allowlist. Not worth an Error Log.
+        frappe.clear_messages()
+        frappe.local.response = frappe._dict(
+            errors=[e.formatted],
+            http_status_code=e.http_status_code
         )
-    )
-    if validation_errors:
-        output = frappe._dict(errors=validation_errors)
+        return
+
+    if plan.errors:
+        output = frappe._dict(errors=plan.errors)
     else:
-        output = execute(
-            query=query,
+        output = execute_plan(
+            plan=plan,
             variables=variables,
             operation_name=operation_name
         )
@@ -35,7 +53,7 @@ def execute_gql_query():
     frappe.local.response = output
     if len(output.get("errors", [])):
         frappe.db.rollback()
-        log_error(query, variables, operation_name, output)
+        log_error(query, variables, operation_name, output, document=plan.document)
         frappe.local.response["http_status_code"] = get_max_http_status_code(output.get("errors"))
         errors = []
         for err in output.errors:
@@ -54,6 +72,7 @@ def get_query():
     query = None
     variables = None
     operation_name = None
+    extensions = None
     if not hasattr(frappe.local, "request"):
         return query, variables, operation_name
 
@@ -62,9 +81,11 @@ def get_query():
     content_type = request.content_type or ""
 
     if request.method == "GET":
-        query = frappe.safe_decode(request.args["query"])
-        variables = frappe.safe_decode(request.args["variables"])
-        operation_name = frappe.safe_decode(request.args["operation_name"])
+        query = frappe.safe_decode(request.args.get("query"))
+        variables = frappe.parse_json(frappe.safe_decode(request.args.get("variables")))
+        operation_name = frappe.safe_decode(
+            request.args.get("operationName") or request.args.get("operation_name"))
+        extensions = frappe.safe_decode(request.args.get("extensions"))
     elif request.method == "POST":
         # raise Exception("Please send in application/json")
         if "application/json" in content_type:
@@ -72,6 +93,7 @@ def get_query():
             query = graphql_request.query
             variables = graphql_request.variables
             operation_name = graphql_request.operationName
+            extensions = graphql_request.extensions
 
         elif "multipart/form-data" in content_type:
             # Follows the spec here: https://github.com/jaydenseric/graphql-multipart-request-spec
@@ -80,6 +102,7 @@ def get_query():
             query = operations.get("query")
             variables = operations.get("variables")
             operation_name = operations.get("operationName")
+            extensions = operations.get("extensions")
 
             files_map = frappe.parse_json(request.form.get("map"))
             for file_key in files_map:
@@ -92,6 +115,9 @@ def get_query():
 
                     obj[path.pop(0)] = file_key
 
+    # Automatic Persisted Queries
+    query = resolve_persisted_query(query=query, extensions=extensions)
+
     return query, variables, operation_name
 
 
@@ -110,7 +136,7 @@ def get_max_http_status_code(errors: List[GraphQLError]):
     return http_status_code
 
 
-def log_error(query, variables, operation_name, output):
+def log_error(query, variables, operation_name, output, document: DocumentNode = None):
     import traceback as tb
     tracebacks = []
     for idx, err in enumerate(output.errors):
@@ -137,9 +163,10 @@ def log_error(query, variables, operation_name, output):
     error_log = frappe.new_doc("GraphQL Error Log")
     error_log.update(frappe._dict(
         title="GraphQL API Error",
-        operation_name=get_operation_name(query, operation_name),
+        operation_name=get_operation_name(query, operation_name, document=document),
         query=query,
-        variables=frappe.as_json(get_masked_variables(query, variables)) if variables else None,
+        variables=frappe.as_json(
+            get_masked_variables(query, variables, document=document)) if variables else None,
         output=frappe.as_json(output),
         traceback=tracebacks
     ))
@@ -1,7 +1,10 @@
 import frappe
 
 from frappe_graphql.utils.resolver.utils import SINGULAR_DOCTYPE_MAP_REDIS_KEY, \
-    PLURAL_DOCTYPE_MAP_REDIS_KEY
+    PLURAL_DOCTYPE_MAP_REDIS_KEY, bump_doctype_map_version
+from frappe_graphql.utils.schema_patch import bump_schema_version
+from frappe_graphql.utils.execution.persisted_operations import \
+    clear_persisted_operations_registry
 
 
 def clear_cache():
@@ -9,3 +12,8 @@ def clear_cache():
         SINGULAR_DOCTYPE_MAP_REDIS_KEY,
         PLURAL_DOCTYPE_MAP_REDIS_KEY
     ])
+    # Invalidates the doctype maps memoized in every process
+    bump_doctype_map_version()
+    clear_persisted_operations_registry(site=frappe.local.site)
+    # Rebuilds the schema of the site on every worker
+    bump_schema_version()
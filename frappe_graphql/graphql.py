@@ -1,21 +1,52 @@
-from graphql_sync_dataloaders import DeferredExecutionContext
-
 import frappe
 import graphql
 
 from frappe_graphql.utils.loader import get_schema
+from frappe_graphql.utils.execution import get_execution_plan, get_execution_context_class
+from frappe_graphql.utils.gql_fields import FIELD_TREES_CONTEXT_KEY
 
 
 @frappe.whitelist(allow_guest=True)
 def execute(query=None, variables=None, operation_name=None):
-    result = graphql.graphql_sync(
-        schema=get_schema(),
-        source=query,
+    """
+    Parses, validates & executes the GraphQL operation.
+    With `frappe_graphql_persisted_operations_only`, only registered operations are executed.
+    """
+    from frappe_graphql.utils.execution.persisted_operations import is_persisted_operations_only
+    from frappe_graphql.utils.persisted_queries import PersistedOperationNotAllowed
+
+    if not isinstance(query, str):
+        return frappe._dict(errors=[graphql.GraphQLError("Please provide a query")])
+
+    plan = get_execution_plan(schema=get_schema(), query=query)
+    if is_persisted_operations_only() and not plan.persisted:
+        return frappe._dict(errors=[PersistedOperationNotAllowed()])
+
+    return execute_plan(plan=plan, variables=variables, operation_name=operation_name)
+
+
+def execute_plan(plan, variables=None, operation_name=None):
+    """
+    Executes an execution plan (see `utils.execution.get_execution_plan`),
+    skipping parsing & validating the query again.
+    Not whitelisted: plans are built on the server, never taken from the request.
+    """
+    schema = get_schema()
+    if plan.errors:
+        return frappe._dict(errors=plan.errors)
+
+    context_value = frappe._dict()
+    if plan.field_trees:
+        context_value[FIELD_TREES_CONTEXT_KEY] = plan.field_trees
+
+    result = graphql.execute_sync(
+        schema=schema,
+        document=plan.document,
         variable_values=variables,
         operation_name=operation_name if operation_name else None,
         middleware=[frappe.get_attr(cmd) for cmd in frappe.get_hooks("graphql_middlewares")],
-        context_value=frappe._dict(),
-        execution_context_class=DeferredExecutionContext
+        context_value=context_value,
+        execution_context_class=get_execution_context_class()
     )
     output = frappe._dict()
     for k in ("data", "errors"):
@@ -42,8 +42,30 @@ graphql_middlewares = ["frappe_graphql.utils.middlewares.disable_introspection_q
 
 doc_events = {
     "*": {
-        # Doc Events Subscription
-        "on_change": "frappe_graphql.frappe_graphql.subscription.doc_events.on_change"
+        "on_change": [
+            # Doc Events Subscription
+            "frappe_graphql.frappe_graphql.subscription.doc_events.on_change",
+            # Link Cache
+            "frappe_graphql.utils.resolver.dataloaders.link_cache.invalidate_link_cache",
+            # Count Cache
+            "frappe_graphql.utils.count_cache.invalidate_count_cache",
+        ],
+        "on_trash": [
+            "frappe_graphql.utils.resolver.dataloaders.link_cache.invalidate_link_cache",
+            "frappe_graphql.utils.count_cache.invalidate_count_cache",
+        ],
+    },
+    # Incremental Schema Updates
+    "DocType": {
+        "on_update": "frappe_graphql.utils.schema_patch.on_doctype_schema_change",
+    },
+    "Custom Field": {
+        "on_update": "frappe_graphql.utils.schema_patch.on_doctype_schema_change",
+        "on_trash": "frappe_graphql.utils.schema_patch.on_doctype_schema_change",
+    },
+    "Property Setter": {
+        "on_update": "frappe_graphql.utils.schema_patch.on_doctype_schema_change",
+        "on_trash": "frappe_graphql.utils.schema_patch.on_doctype_schema_change",
     }
 }
 
@@ -0,0 +1,140 @@
+from typing import List
+
+import frappe
+from frappe.model import default_fields
+from frappe.utils import cint
+from graphql import GraphQLError
+
+from frappe_graphql.utils.cursor_pagination import process_filters
+from frappe_graphql.utils.permissions import get_allowed_fieldnames_for_doctype
+
+"""
+Aggregates
+
+Every plural root query has an aggregate counterpart that groups & aggregates in SQL:
+    SalesInvoicesAggregate(
+        filter: [{fieldname: "docstatus", operator: EQ, value: "1"}],
+        groupBy: ["customer"],
+        metrics: [{function: SUM, field: "grand_total"}, {function: COUNT}]
+    ) {
+        group { field value }
+        metrics { function field value }
+    }
+
+At most `limit` groups are returned (100 by default), capped at the site config
+`frappe_graphql_aggregate_max_limit` (1000 by default).
+
+The query goes through frappe.get_list, so that the permission filters (User Permissions,
+permission_query_conditions) apply. Only the fields the user can read (permlevels) can be
+grouped & aggregated on.
+"""
+
+AGGREGATE_FUNCTIONS = ("COUNT", "SUM", "AVG", "MIN", "MAX")
+NUMERIC_FIELDTYPES = ("Int", "Long Int", "Check", "Float", "Currency", "Percent")
+AGGREGATE_DEFAULT_LIMIT = 100
+AGGREGATE_DEFAULT_MAX_LIMIT = 1000
+
+
+def get_aggregates(doctype: str, filters: list = None, group_by: List[str] = None,
+                   metrics: List[dict] = None, limit: int = None):
+    """
+    Returns a list of
+        frappe._dict(
+            group=[frappe._dict(field, value)],
+            metrics=[frappe._dict(function, field, value)]
+        )
+    one per group, ordered by the group by fields
+    """
+    group_by = list(group_by or [])
+    metrics = list(metrics or [])
+    if not len(metrics):
+        raise GraphQLError("Please specify at least one metric")
+
+    if limit is None:
+        limit = AGGREGATE_DEFAULT_LIMIT
+    max_limit = get_aggregate_max_limit()
+    if not (isinstance(limit, int) and limit > 0):
+        raise GraphQLError("Argument `limit` must be a positive integer.")
+    if limit > max_limit:
+        raise GraphQLError(f"Argument `limit` cannot exceed {max_limit}.")
+
+    for fieldname in group_by:
+        validate_aggregate_field(doctype, fieldname)
+
+    fields = [*group_by]
+    for i, metric in enumerate(metrics):
+        fields.append(f"{get_metric_sql(doctype, metric)} as metric_{i}")
+
+    kwargs = frappe._dict()
+    if len(group_by):
+        kwargs.group_by = kwargs.order_by = ", ".join(group_by)
+
+    rows = frappe.get_list(
+        doctype,
+        fields=fields,
+        filters=process_filters(filters or []),
+        limit_page_length=limit,
+        **kwargs
+    )
+
+    return [
+        frappe._dict(
+            group=[
+                frappe._dict(field=fieldname, value=format_group_value(row.get(fieldname)))
+                for fieldname in group_by
+            ],
+            metrics=[
+                frappe._dict(
+                    function=metric.get("function"),
+                    field=metric.get("field"),
+                    value=row.get(f"metric_{i}")
+                )
+                for i, metric in enumerate(metrics)
+            ]
+        )
+        for row in rows
+    ]
+
+
+def get_metric_sql(doctype: str, metric: dict):
+    function = metric.get("function")
+    fieldname = metric.get("field")
+    if function not in AGGREGATE_FUNCTIONS:
+        raise GraphQLError(f"Invalid aggregate function: {function}")
+
+    if function == "COUNT":
+        if not fieldname:
+            return "count(*)"
+        validate_aggregate_field(doctype, fieldname)
+        return f"count({fieldname})"
+
+    if not fieldname:
+        raise GraphQLError(f"Please specify the field to {function}")
+
+    validate_aggregate_field(doctype, fieldname, numeric=True)
+    return f"{function.lower()}({fieldname})"
+
+
+def validate_aggregate_field(doctype: str, fieldname: str, numeric: bool = False):
+    meta = frappe.get_meta(doctype)
+    if fieldname not in get_allowed_fieldnames_for_doctype(doctype) or \
+            fieldname not in [*default_fields, *meta.get_valid_columns()]:
+        raise GraphQLError(f"Invalid field: {fieldname}")
+
+    if numeric:
+        df = meta.get_field(fieldname)
+        if fieldname not in ("idx", "docstatus") and \
+                (not df or df.fieldtype not in NUMERIC_FIELDTYPES):
+            raise GraphQLError(f"{fieldname} is not a numeric field")
+
+
+def get_aggregate_max_limit():
+    return cint(frappe.local.conf.get("frappe_graphql_aggregate_max_limit")) \
+        or AGGREGATE_DEFAULT_MAX_LIMIT
+
+
+def format_group_value(value):
+    if value is None:
+        return None
+
+    return str(value)
@@ -0,0 +1,97 @@
+import hashlib
+
+import frappe
+from frappe.utils import cint
+
+"""
+Count Cache
+
+Paging through a list recomputes the same totalCount on every page.
+When `frappe_graphql_count_cache_ttl` (seconds) is set in the site config, counts are
+cached in Redis keyed by (doctype, count mode, filters, permission scope).
+
+The permission scope is the match conditions (User Permissions, permission_query_conditions)
+applied to the current user, so users with the same restrictions share the counts.
+
+Every DocType has a version stamp in Redis that is bumped on any change to its documents
+(doc_events on_change / on_trash), which invalidates its cached counts. Child DocTypes are
+updated without doc events & are picked up when the counts expire.
+"""
+
+COUNT_CACHE_VERSIONS_REDIS_KEY = "graphql_count_cache_versions"
+COUNT_CACHE_REDIS_KEY = "graphql_count_cache"
+
+
+def get_count_cache_ttl():
+    return cint(frappe.local.conf.get("frappe_graphql_count_cache_ttl"))
+
+
+def get_cached_count(doctype: str, filters: list, count_mode: str = None, resolve_count=None):
+    """
+    Returns the cached count, or the count from resolve_count() which is then cached
+    """
+    ttl = get_count_cache_ttl()
+    if not ttl or not frappe.has_permission(doctype, "read"):
+        return resolve_count()
+
+    key = get_count_cache_key(doctype, filters, count_mode)
+    count = frappe.cache().get_value(key)
+    if count is not None:
+        return count
+
+    count = resolve_count()
+    frappe.cache().set_value(key, count, expires_in_sec=ttl)
+    return count
+
+
+def get_count_cache_key(doctype: str, filters: list, count_mode: str = None):
+    normalized_filters = sorted(frappe.as_json(x, indent=None) for x in (filters or []))
+    scope = frappe.build_match_conditions(doctype) or ""
+    digest = hashlib.md5(frappe.safe_encode(
+        frappe.as_json([count_mode, normalized_filters, scope], indent=None))).hexdigest()
+
+    return f"{COUNT_CACHE_REDIS_KEY}|{doctype}|{get_count_cache_version(doctype)}|{digest}"
+
+
+def get_count_cache_version(doctype: str):
+    """
+    The version stamp of the doctype, checked once per request
+    """
+    if not hasattr(frappe.local, "graphql_count_cache_versions"):
+        frappe.local.graphql_count_cache_versions = {}
+
+    version = frappe.local.graphql_count_cache_versions.get(doctype)
+    if version:
+        return version
+
+    version = frappe.cache().hget(COUNT_CACHE_VERSIONS_REDIS_KEY, doctype)
+    if not version:
+        version = bump_count_cache_version(doctype)
+
+    frappe.local.graphql_count_cache_versions[doctype] = version
+    return version
+
+
+def bump_count_cache_version(doctype: str):
+    version = frappe.generate_hash(length=10)
+    frappe.cache().hset(COUNT_CACHE_VERSIONS_REDIS_KEY, doctype, version)
+
+    if hasattr(frappe.local, "graphql_count_cache_versions"):
+        frappe.local.graphql_count_cache_versions[doctype] = version
+
+    return version
+
+
+def invalidate_count_cache(doc, method=None):
+    """
+    doc_events handler, on_change & on_trash of every DocType
+    """
+    if not get_count_cache_ttl():
+        return
+
+    bump_count_cache_version(doc.doctype)
+
+    after_commit = getattr(frappe.db, "after_commit", None)
+    if after_commit is not None:
+        # Counts cached by other requests before this transaction was committed
+        after_commit.add(lambda: bump_count_cache_version(doc.doctype))
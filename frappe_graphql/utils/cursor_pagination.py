@@ -1,8 +1,22 @@
 import frappe
 import base64
+import struct
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 from typing import List
 from graphql import GraphQLResolveInfo, GraphQLError
-from frappe_graphql.utils.gql_fields import get_doctype_requested_fields
+from frappe_graphql.utils.count_cache import get_cached_count
+from frappe_graphql.utils import get_info_path_key
+from frappe_graphql.utils.db import get_estimated_count, get_windowed_query, \
+    warn_if_sort_not_indexed
+from frappe_graphql.utils.gql_fields import get_doctype_requested_fields, get_field_tree_dict
+
+COUNT_MODES = ("EXACT", "APPROXIMATE")
+
+# Standard columns that are declared NOT NULL. creation, modified, owner & modified_by
+# are nullable in the DDL
+NOT_NULL_COLUMNS = ("name", "idx", "docstatus")
+NOT_NULL_FIELDTYPES = ("Int", "Check", "Float", "Currency", "Percent")
 
 
 class CursorPaginator(object):
@@ -15,12 +29,17 @@ class CursorPaginator(object):
         node_resolver=None,
         default_sorting_fields=None,
         default_sorting_direction=None,
+        count_mode=None,
+        link_field=None,
         extra_args=None):
 
         if (not count_resolver) != (not node_resolver):
             frappe.throw(
                 "Please provide both count_resolver & node_resolver to have custom implementation")
 
+        if link_field and count_resolver:
+            frappe.throw("Custom resolvers cannot be used along with link_field")
+
         self.doctype = doctype
         self.predefined_filters = filters
         self.skip_process_filters = skip_process_filters
@@ -28,6 +47,9 @@ class CursorPaginator(object):
         self.custom_node_resolver = node_resolver
         self.default_sorting_fields = default_sorting_fields
         self.default_sorting_direction = default_sorting_direction
+        self.count_mode = count_mode
+        # Connections of all the parents (obj.name) at a level are resolved together
+        self.link_field = link_field
 
         # Extra Args are helpful for custom resolvers
         self.extra_args = extra_args
@@ -51,6 +73,7 @@ class CursorPaginator(object):
         self.filters.extend(self.predefined_filters or [])
 
         self.sorting_fields, self.sort_dir = self.get_sort_args(kwargs.get("sortBy"))
+        self.sorting_fields = self.get_keyset_sorting_fields(self.sorting_fields)
 
         self.original_sort_dir = self.sort_dir
         if self.last:
@@ -66,14 +89,28 @@ class CursorPaginator(object):
         if not self.skip_process_filters:
             self.filters = self.process_filters(self.filters)
 
-        count = self.get_count(self.doctype, self.filters)
+        if self.link_field:
+            return self.get_batched_loader().load(obj.get("name"))
+
+        # COUNT(*) could be expensive on large tables
+        count = None
+        if self.is_total_count_requested():
+            count = self.get_count(self.doctype, self.filters)
 
         if self.cursor:
             # Cursor filter should be applied after taking count
-            self.has_previous_page = True
             self.filters.append(self.get_cursor_filter())
 
         data = self.get_data(self.doctype, self.filters, self.sorting_fields, self.sort_dir, limit)
+        return self.get_connection(data, count, requested_count)
+
+    def get_connection(self, data, count, requested_count):
+        """
+        Builds the connection from the rows fetched (requested_count + 1 at most)
+        """
+        self.has_next_page = False
+        self.has_previous_page = bool(self.cursor)
+
         matched_count = len(data)
         if matched_count > requested_count:
             self.has_next_page = True
@@ -84,23 +121,117 @@ class CursorPaginator(object):
             _swap_has_page = self.has_next_page
             self.has_next_page = self.has_previous_page
             self.has_previous_page = _swap_has_page
-            data = reversed(data)
+            data = list(reversed(data))
 
+        # Cursors of every edge are generated only when they are selected
+        with_edge_cursors = self.is_edge_cursor_requested()
         edges = [frappe._dict(
-            cursor=self.to_cursor(x, sorting_fields=self.sorting_fields), node=x
+            cursor=self.to_cursor(x, sorting_fields=self.sorting_fields)
+            if with_edge_cursors else None,
+            node=x
         ) for x in data]
 
+        start_cursor, end_cursor = None, None
+        if len(edges):
+            start_cursor = edges[0].cursor if with_edge_cursors \
+                else self.to_cursor(edges[0].node, sorting_fields=self.sorting_fields)
+            end_cursor = edges[-1].cursor if with_edge_cursors \
+                else self.to_cursor(edges[-1].node, sorting_fields=self.sorting_fields)
+
         return frappe._dict(
             totalCount=count,
             pageInfo=frappe._dict(
                 hasNextPage=self.has_next_page,
                 hasPreviousPage=self.has_previous_page,
-                startCursor=edges[0].cursor if len(edges) else None,
-                endCursor=edges[-1].cursor if len(edges) else None
+                startCursor=start_cursor,
+                endCursor=end_cursor
             ),
             edges=edges
         )
 
+    def get_batched_loader(self):
+        """
+        Parents at the same path, with the same arguments & paginator options, share the loader
+        """
+        from frappe_graphql.utils.resolver.dataloaders import FrappeDataloader
+        from frappe_graphql.utils.resolver.dataloaders.locals import get_loader_from_locals, \
+            set_loader_in_locals
+
+        locals_key = (
+            "CursorPaginator", self.doctype, self.link_field,
+            get_info_path_key(self.resolve_info), frappe.as_json(self.resolve_kwargs),
+            frappe.as_json(self.predefined_filters), self.skip_process_filters,
+            tuple(self.default_sorting_fields or []), self.default_sorting_direction,
+            self.count_mode
+        )
+        loader = get_loader_from_locals(locals_key)
+        if not loader:
+            loader = FrappeDataloader(self.resolve_batch)
+            set_loader_in_locals(locals_key, loader)
+
+        return loader
+
+    def resolve_batch(self, parents):
+        """
+        Resolves the connections of all the parents with
+        - a grouped count, when totalCount is requested
+        - a windowed query, limiting the rows per parent via ROW_NUMBER()
+        """
+        if any("." in x for x in self.sorting_fields):
+            frappe.throw("Sorting on other tables is not supported along with link_field")
+
+        requested_count = self.first or self.last
+        filters = [*self.filters, [self.link_field, "in", parents]]
+
+        counts = {}
+        if self.is_total_count_requested():
+            counts = {
+                x.get(self.link_field): x.total_count
+                for x in frappe.get_list(
+                    self.doctype,
+                    fields=[self.link_field, "COUNT(*) as total_count"],
+                    filters=filters,
+                    group_by=self.link_field,
+                    order_by=self.link_field
+                )
+            }
+
+        if self.cursor:
+            # Cursor filter should be applied after taking count
+            filters.append(self.get_cursor_filter())
+
+        fields = self.get_fields_to_fetch(self.doctype, filters, self.sorting_fields)
+        if self.link_field not in fields:
+            fields = [*fields, self.link_field]
+
+        query = frappe.get_list(
+            self.doctype,
+            fields=fields,
+            filters=filters,
+            run=0
+        )
+        rows = frappe.db.sql(get_windowed_query(
+            query,
+            partition_by=[self.link_field],
+            order_by=[(x, self.sort_dir) for x in self.sorting_fields],
+            limit=requested_count + 1,
+        ), as_dict=True)
+
+        parent_rows = {parent: [] for parent in parents}
+        for row in rows:
+            row.pop("_row_number", None)
+            if row.get(self.link_field) in parent_rows:
+                parent_rows[row.get(self.link_field)].append(row)
+
+        return [
+            self.get_connection(
+                parent_rows[parent],
+                counts.get(parent, 0) if self.is_total_count_requested() else None,
+                requested_count
+            )
+            for parent in parents
+        ]
+
     def validate_connection_args(self, args):
         first = args.get("first")
         last = args.get("last")
@@ -118,6 +249,28 @@ class CursorPaginator(object):
         if last and args.get("after"):
             raise GraphQLError("Argument `last` cannot be combined with `after`.")
 
+    def is_total_count_requested(self):
+        return "totalCount" in get_field_tree_dict(self.resolve_info)
+
+    def is_edge_cursor_requested(self):
+        return "cursor" in (get_field_tree_dict(self.resolve_info).get("edges") or {})
+
+    def get_count_mode(self):
+        """
+        countMode argument > count_mode of the paginator > site config
+            "frappe_graphql_approximate_count_doctypes": ["GL Entry", "Stock Ledger Entry"]
+        """
+        count_mode = self.resolve_kwargs.get("countMode") or self.count_mode
+        if not count_mode:
+            approximate_doctypes = frappe.local.conf.get(
+                "frappe_graphql_approximate_count_doctypes") or []
+            count_mode = "APPROXIMATE" if self.doctype in approximate_doctypes else "EXACT"
+
+        if count_mode not in COUNT_MODES:
+            raise GraphQLError(f"Invalid count mode: {count_mode}")
+
+        return count_mode
+
     def get_count(self, doctype, filters):
         if self.custom_count_resolver:
             return self.custom_count_resolver(
@@ -125,6 +278,23 @@ class CursorPaginator(object):
                 filters=filters
             )
 
+        count_mode = self.get_count_mode()
+        return get_cached_count(
+            doctype,
+            filters,
+            count_mode=count_mode,
+            resolve_count=lambda: self.resolve_count(doctype, filters, count_mode)
+        )
+
+    def resolve_count(self, doctype, filters, count_mode):
+        if count_mode == "APPROXIMATE":
+            return get_estimated_count(doctype, frappe.get_list(
+                doctype,
+                fields=["name"],
+                filters=filters,
+                run=0
+            ))
+
         return frappe.get_list(
             doctype,
             fields=["COUNT(*) as total_count"],
@@ -177,23 +347,27 @@ class CursorPaginator(object):
 
         return sorting_fields, sort_dir
 
-    def process_filters(self, input_filters):
-        filters = []
-        operator_map = frappe._dict(
-            EQ="=", NEQ="!=", LT="<", GT=">", LTE="<=", GTE=">=",
-            LIKE="like", NOT_LIKE="not like"
-        )
-        for f in input_filters:
-            if not isinstance(f, dict):
-                filters.append(f)
-            else:
-                filters.append([
-                    f.get("fieldname"),
-                    operator_map[f.get("operator")],
-                    f.get("value")
-                ])
+    def get_keyset_sorting_fields(self, sorting_fields):
+        """
+        `name` is appended as a unique tiebreaker, so that rows sharing the same sort values
+        are neither skipped nor repeated across pages.
+        Custom node resolvers are left as is, since they build their own rows.
+        """
+        self.has_tiebreaker = False
+        if self.custom_node_resolver or "name" in sorting_fields \
+                or any("." in x for x in sorting_fields):
+            return sorting_fields
+
+        self.has_tiebreaker = True
+        sorting_fields = [*sorting_fields, "name"]
+
+        if frappe.conf.get("developer_mode"):
+            warn_if_sort_not_indexed(self.doctype, sorting_fields)
 
-        return filters
+        return sorting_fields
+
+    def process_filters(self, input_filters):
+        return process_filters(input_filters)
 
     def get_cursor_filter(self):
         """
@@ -274,7 +448,8 @@ class CursorPaginator(object):
                         sorting_fields=sorting_fields[1:], values=values[1:])
 
                 if sub_condition:
-                    return f"(({format_column_name(sorting_fields[0])} IS NULL AND {sub_condition})" \
+                    return f"(({format_column_name(sorting_fields[0])} IS NULL " \
+                           + f"AND {sub_condition})" \
                            + f" OR {format_column_name(sorting_fields[0])} IS NOT NULL)"
                 return ""
 
@@ -306,20 +481,181 @@ class CursorPaginator(object):
 
             return condition
 
-        if len(self.sorting_fields) != len(cursor_values):
+        sorting_fields = self.sorting_fields
+        if self.has_tiebreaker and len(cursor_values) == len(sorting_fields) - 1:
+            # Cursors issued before the tiebreaker was appended
+            sorting_fields = sorting_fields[:-1]
+
+        if len(sorting_fields) != len(cursor_values):
             frappe.throw("Invalid Cursor")
 
-        return _get_cursor_condition(sorting_fields=self.sorting_fields, values=cursor_values)
+        if self.is_not_null_keyset(sorting_fields, cursor_values):
+            # Row value comparison, which can be satisfied by a range scan
+            # over a composite index on the sort fields
+            columns = ", ".join(format_column_name(x) for x in sorting_fields)
+            values = ", ".join(db_escape(x) for x in cursor_values)
+            return f"({columns}) {operator} ({values})"
+
+        return _get_cursor_condition(sorting_fields=sorting_fields, values=cursor_values)
+
+    def is_not_null_keyset(self, sorting_fields, values):
+        """
+        Row value comparisons skip the NULL handling, and can be used only when
+        none of the sort columns can be NULL, as per the Meta of the DocType
+        """
+        if any(x is None for x in values):
+            return False
+
+        meta = frappe.get_meta(self.doctype)
+        for fieldname in sorting_fields:
+            if fieldname in NOT_NULL_COLUMNS:
+                continue
+
+            df = meta.get_field(fieldname)
+            if not df or not (df.get("not_nullable") or df.reqd
+                              or df.fieldtype in NOT_NULL_FIELDTYPES):
+                return False
+
+        return True
 
     def to_cursor(self, row, sorting_fields):
         # sorting_fields could be [custom_table.field_1],
         # where only field_1 will be available on row
-        _json = frappe.as_json([row.get(x.split('.')[1] if '.' in x else x)
-                                for x in sorting_fields])
-        return frappe.safe_decode(base64.b64encode(_json.encode("utf-8")))
+        return encode_cursor([row.get(x.split('.')[1] if '.' in x else x)
+                              for x in sorting_fields])
 
     def from_cursor(self, cursor):
-        return frappe.parse_json(frappe.safe_decode(base64.b64decode(cursor)))
+        return decode_cursor(cursor)
+
+
+# Cursors are the sort values of the row, packed along with their types
+# & urlsafe base64 encoded: version (1 byte) | (type tag (1 byte) | value)*
+# Cursors issued before (base64 encoded JSON lists) are still accepted.
+
+CURSOR_VERSION = 1
+
+_CURSOR_STRUCTS = frappe._dict(
+    int=struct.Struct(">q"),
+    float=struct.Struct(">d"),
+    length=struct.Struct(">I"),
+    date=struct.Struct(">HBB"),
+    datetime=struct.Struct(">HBBBBBI"),
+    time=struct.Struct(">BBBI"),
+)
+
+
+def encode_cursor(values: list) -> str:
+    s = _CURSOR_STRUCTS
+    packed = bytearray([CURSOR_VERSION])
+    for value in values:
+        if value is None:
+            packed += b"N"
+        elif isinstance(value, bool):
+            packed += b"B" + bytes([int(value)])
+        elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            packed += b"I" + s.int.pack(value)
+        elif isinstance(value, float):
+            packed += b"F" + s.float.pack(value)
+        elif isinstance(value, datetime):
+            packed += b"T" + s.datetime.pack(
+                value.year, value.month, value.day,
+                value.hour, value.minute, value.second, value.microsecond)
+        elif isinstance(value, date):
+            packed += b"D" + s.date.pack(value.year, value.month, value.day)
+        elif isinstance(value, time):
+            packed += b"H" + s.time.pack(
+                value.hour, value.minute, value.second, value.microsecond)
+        elif isinstance(value, timedelta):
+            packed += b"E" + s.int.pack(
+                (value.days * 86400 + value.seconds) * 10 ** 6 + value.microseconds)
+        else:
+            # str, Decimal & everything else
+            tag = b"M" if isinstance(value, Decimal) else b"S"
+            encoded = frappe.safe_encode(str(value))
+            packed += tag + s.length.pack(len(encoded)) + encoded
+
+    return frappe.safe_decode(base64.urlsafe_b64encode(bytes(packed))).rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        packed = base64.urlsafe_b64decode(frappe.safe_encode(cursor + "=" * (-len(cursor) % 4)))
+        if packed[:1] == b"[":
+            # base64 encoded JSON
+            return frappe.parse_json(frappe.safe_decode(packed))
+
+        return _unpack_cursor(packed)
+    except Exception:
+        frappe.throw("Invalid Cursor")
+
+
+def _unpack_cursor(packed: bytes) -> list:
+    s = _CURSOR_STRUCTS
+    if packed[0] != CURSOR_VERSION:
+        raise ValueError(f"Unknown cursor version: {packed[0]}")
+
+    values = []
+    offset = 1
+    while offset < len(packed):
+        tag = packed[offset:offset + 1]
+        offset += 1
+        if tag == b"N":
+            values.append(None)
+        elif tag == b"B":
+            values.append(bool(packed[offset]))
+            offset += 1
+        elif tag == b"I":
+            values.append(s.int.unpack_from(packed, offset)[0])
+            offset += s.int.size
+        elif tag == b"F":
+            values.append(s.float.unpack_from(packed, offset)[0])
+            offset += s.float.size
+        elif tag == b"T":
+            values.append(datetime(*s.datetime.unpack_from(packed, offset)))
+            offset += s.datetime.size
+        elif tag == b"D":
+            values.append(date(*s.date.unpack_from(packed, offset)))
+            offset += s.date.size
+        elif tag == b"H":
+            values.append(time(*s.time.unpack_from(packed, offset)))
+            offset += s.time.size
+        elif tag == b"E":
+            values.append(timedelta(microseconds=s.int.unpack_from(packed, offset)[0]))
+            offset += s.int.size
+        elif tag in (b"S", b"M"):
+            length = s.length.unpack_from(packed, offset)[0]
+            offset += s.length.size
+            if offset + length > len(packed):
+                raise ValueError("Truncated cursor")
+            value = frappe.safe_decode(packed[offset:offset + length])
+            values.append(Decimal(value) if tag == b"M" else value)
+            offset += length
+        else:
+            raise ValueError(f"Unknown cursor value type: {tag}")
+
+    return values
+
+
+def process_filters(input_filters):
+    """
+    Converts DBFilterInputs to frappe filters
+    """
+    filters = []
+    operator_map = frappe._dict(
+        EQ="=", NEQ="!=", LT="<", GT=">", LTE="<=", GTE=">=",
+        LIKE="like", NOT_LIKE="not like"
+    )
+    for f in input_filters:
+        if not isinstance(f, dict):
+            filters.append(f)
+        else:
+            filters.append([
+                f.get("fieldname"),
+                operator_map[f.get("operator")],
+                f.get("value")
+            ])
+
+    return filters
 
 
 def get_paginator_fields(
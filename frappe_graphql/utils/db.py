@@ -0,0 +1,93 @@
+import json
+from typing import List, Tuple
+
+import frappe
+from frappe.utils import cint, flt
+
+
+def get_windowed_query(query: str, partition_by: List[str], order_by: List[Tuple[str, str]],
+                       offset: int = 0, limit: int = None,
+                       row_number_column: str = "_row_number"):
+    """
+    Wraps a SELECT query to return at most `limit` rows of each partition, after skipping the
+    first `offset` rows of each. Rows are numbered via ROW_NUMBER() OVER (PARTITION BY ..),
+    so the first N rows of many parents can be fetched in a single query.
+
+    The query is expected to select the columns in partition_by & order_by.
+
+    Parameters:
+        query: SELECT query, eg: frappe.get_all(..., run=0)
+        partition_by: list of columns
+        order_by: list of (column, direction)
+        offset: rows to skip in each partition
+        limit: rows to return from each partition. All the rows when not specified
+        row_number_column: the column the row number of each row is returned in
+    """
+    partition = ", ".join(f"_q.{column}" for column in partition_by)
+    order = ", ".join(f"_q.{column} {direction}" for column, direction in order_by)
+
+    sql = f"select * from (select _q.*, row_number() over (partition by {partition} " \
+          f"order by {order}) as {row_number_column} from ({query}) _q) _w " \
+          f"where _w.{row_number_column} > {cint(offset)}"
+    if limit:
+        sql += f" and _w.{row_number_column} <= {cint(offset) + cint(limit)}"
+    sql += f" order by _w.{row_number_column}"
+
+    return sql
+
+
+def get_estimated_count(doctype: str, query: str):
+    """
+    Number of rows the query is expected to return, as estimated by the query planner
+    from the table statistics. Much cheaper than COUNT(*) on large tables, but could be
+    off by a wide margin.
+
+    Parameters:
+        doctype: the doctype the query is on
+        query: SELECT query, eg: frappe.get_list(..., run=0)
+    """
+    if frappe.db.db_type == "postgres":
+        plan = frappe.db.sql(f"explain (format json) {query}")[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return cint(plan[0].get("Plan", {}).get("Plan Rows"))
+
+    rows = frappe.db.sql(f"explain {query}", as_dict=True)
+    if not len(rows):
+        return 0
+
+    row = next((x for x in rows if x.get("table") == f"tab{doctype}"), rows[0])
+    estimate = flt(row.get("rows"))
+    if row.get("filtered") is not None:
+        estimate = estimate * flt(row.get("filtered")) / 100
+
+    return cint(estimate)
+
+
+checked_sort_indexes = set()
+
+
+def warn_if_sort_not_indexed(doctype: str, sorting_fields: List[str]):
+    """
+    Warns (once per doctype & sort fields) when no index starts with the sort fields.
+    Pages deep into large tables are then sorted via full scans.
+    `name` (the primary key) is part of every secondary index on MariaDB
+    """
+    key = (frappe.local.site, doctype, tuple(sorting_fields))
+    if key in checked_sort_indexes or frappe.db.db_type == "postgres":
+        return
+
+    checked_sort_indexes.add(key)
+
+    columns = [x for x in sorting_fields if x != "name"] or ["name"]
+    indexes = {}
+    for row in frappe.db.sql(f"show index from `tab{doctype}`", as_dict=True):
+        indexes.setdefault(row.Key_name, []).append((cint(row.Seq_in_index), row.Column_name))
+
+    for index_columns in indexes.values():
+        index_columns = [column for _, column in sorted(index_columns)]
+        if index_columns[:len(columns)] == columns:
+            return
+
+    frappe.errprint(f"No index on `tab{doctype}` covers the sort fields ({', '.join(columns)}). "
+                    "Deep pagination will require full table scans")
@@ -0,0 +1,133 @@
+import hashlib
+from typing import List, Optional, Tuple
+
+from graphql import (DocumentNode, GraphQLError, GraphQLSchema, OperationDefinitionNode,
+                     OperationType, parse, specified_rules, validate)
+
+import frappe
+from frappe.utils import cint
+
+from frappe_graphql.utils.depth_limit_validator import depth_limit_validator
+from .document_cache import document_cache, get_document_cache_key, get_document_cache_size
+
+
+def get_max_depth():
+    return cint(frappe.local.conf.get("frappe_graphql_depth_limit")) or 10
+
+
+def get_validation_rules():
+    """
+    The standard GraphQL validation rules along with our depth limit rule
+    """
+    return (
+        *specified_rules,
+        depth_limit_validator(max_depth=get_max_depth()),
+    )
+
+
+def get_execution_context_class():
+    """
+    The compiled executor is opt-in via the site config
+    `frappe_graphql_compiled_execution: 1`, since it skips middlewares on plain scalar fields
+    """
+    if cint(frappe.local.conf.get("frappe_graphql_compiled_execution")):
+        from .compiler import CompiledExecutionContext
+        return CompiledExecutionContext
+
+    from .context import FrappeExecutionContext
+    return FrappeExecutionContext
+
+
+def get_execution_plan(schema: GraphQLSchema, query: str):
+    """
+    Returns the execution plan for the query text:
+
+        frappe._dict(
+            document=DocumentNode,  # None when the query could not be parsed
+            errors=[GraphQLError],  # parse / validation errors
+            field_trees=dict,       # precomputed field trees, if any
+            persisted=bool,         # True for registered persisted operations
+        )
+
+    Registered persisted operations come precompiled. Other queries are parsed &
+    validated once and kept in a process-wide LRU, so repeat operations skip
+    parse & validate altogether.
+    """
+    from .persisted_operations import get_persisted_operation_by_hash
+
+    if not isinstance(query, str):
+        return build_execution_plan(schema=schema, query=query)
+
+    query_hash = hashlib.sha256(frappe.safe_encode(query)).hexdigest()
+    plan = get_persisted_operation_by_hash(schema=schema, query_hash=query_hash)
+    if plan is not None:
+        return plan
+
+    cache_size = get_document_cache_size()
+    if not cache_size:
+        return build_execution_plan(schema=schema, query=query)
+
+    key = get_document_cache_key(schema=schema, query_hash=query_hash, max_depth=get_max_depth())
+    plan = document_cache.get(key)
+    if plan is not None:
+        return plan
+
+    plan = build_execution_plan(schema=schema, query=query)
+    if plan.document is None or is_cacheable_document(plan.document):
+        document_cache.set(key, plan, maxsize=cache_size)
+
+    return plan
+
+
+def parse_and_validate(
+    schema: GraphQLSchema,
+    query: str
+) -> Tuple[Optional[DocumentNode], List[GraphQLError]]:
+    """
+    Parses the query text once and validates the resulting DocumentNode.
+    The same DocumentNode can then be used for execution, operation-name
+    resolution and variable masking without parsing the query again.
+
+    Returns:
+        (document, errors). document is None when the query could not be parsed.
+    """
+    plan = get_execution_plan(schema=schema, query=query)
+    return plan.document, plan.errors
+
+
+def build_execution_plan(schema: GraphQLSchema, query: str, precompute: bool = False):
+    """
+    Parses & validates the query.
+    With `precompute`, the field trees used to work out the requested fields of
+    DocTypes are also computed ahead of execution.
+    """
+    plan = frappe._dict(document=None, errors=[], field_trees=None, persisted=False)
+    try:
+        plan.document = parse(query)
+    except GraphQLError as e:
+        plan.errors = [e]
+        return plan
+
+    plan.errors = validate(
+        schema=schema,
+        document_ast=plan.document,
+        rules=get_validation_rules()
+    )
+
+    if precompute and not plan.errors:
+        from frappe_graphql.utils.gql_fields import get_document_field_trees
+        plan.field_trees = get_document_field_trees(plan.document)
+
+    return plan
+
+
+def is_cacheable_document(document: DocumentNode):
+    """
+    Subscription documents are modified in place while setting up the subscription
+    (please see `utils.subscriptions.filter_selection_set`), so they cannot be shared.
+    """
+    return not any(
+        isinstance(definition, OperationDefinitionNode)
+        and definition.operation == OperationType.SUBSCRIPTION
+        for definition in document.definitions
+    )
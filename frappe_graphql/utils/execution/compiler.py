@@ -0,0 +1,154 @@
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, List
+
+from graphql import (FieldNode, GraphQLObjectType, GraphQLNonNull, OperationDefinitionNode,
+                     is_leaf_type)
+from graphql.pyutils import Path, Undefined
+
+from .context import FrappeExecutionContext
+
+"""
+Compiled Execution
+
+graphql-core resolves every field through the same generic path: field definition
+lookup, GraphQLResolveInfo construction, the middleware chain, the resolver and then
+value completion. For large list queries most of the fields are plain scalar columns
+read off a dict returned by frappe.get_list, and the generic path dominates.
+
+In the spirit of graphql-jit, every field of an operation is compiled once. Plain scalar
+fields (no custom resolver, no arguments) are read & serialized directly, everything else
+goes through the regular execution. Only `execute_field` is overridden, so the field loop
+of the execution context (graphql_sync_dataloaders) is used as is. Compiled fields are kept
+along with the operation, so repeat operations (see the document cache) reuse them
+across requests.
+
+Please note that middlewares are not run for the plain scalar fields.
+"""
+
+compiled_operations: Dict[int, Dict[tuple, tuple]] = {}
+
+
+class CompiledExecutionContext(FrappeExecutionContext):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compiled_fields = {}
+        self._operation_fields = None
+
+    def execute_field(
+        self,
+        parent_type: GraphQLObjectType,
+        source: Any,
+        field_nodes: List[FieldNode],
+        path: Path,
+    ):
+        key = (parent_type, id(field_nodes[0]))
+        try:
+            step = self._compiled_fields[key]
+        except KeyError:
+            step = self._compiled_fields[key] = self.get_compiled_field(
+                key, parent_type, field_nodes)
+
+        if step is not None:
+            field_name, serialize, non_null = step
+            try:
+                if isinstance(source, Mapping):
+                    value = source.get(field_name)
+                else:
+                    value = getattr(source, field_name, None)
+            except Exception:
+                value = Undefined
+
+            if value is None and not non_null:
+                return None
+
+            if value is not None and value is not Undefined and not callable(value):
+                try:
+                    serialized = serialize(value)
+                except Exception:
+                    serialized = None
+
+                if serialized is not None and serialized is not Undefined:
+                    return serialized
+
+            # Let the regular execution raise the appropriate field error
+
+        return super().execute_field(parent_type, source, field_nodes, path)
+
+    def get_compiled_field(self, key: tuple, parent_type: GraphQLObjectType,
+                           field_nodes: List[FieldNode]):
+        """
+        Compiled fields are stored per operation, keyed by the parent type & FieldNode.
+        They are verified against the schema once per execution, since the schema
+        could have been modified in the meantime.
+        """
+        operation_fields = self.get_operation_fields()
+
+        compiled = operation_fields.get(key)
+        if compiled is not None and is_valid_compiled_field(parent_type, compiled):
+            return compiled[-1]
+
+        compiled = compile_field(parent_type, field_nodes)
+        operation_fields[key] = compiled
+        return compiled[-1]
+
+    def get_operation_fields(self):
+        if self._operation_fields is None:
+            self._operation_fields = get_compiled_operation(self.operation)
+
+        return self._operation_fields
+
+
+def get_compiled_operation(operation: OperationDefinitionNode):
+    key = id(operation)
+    if key not in compiled_operations:
+        compiled_operations[key] = {}
+        # Drop the compiled fields along with the operation
+        weakref.finalize(operation, compiled_operations.pop, key, None)
+
+    return compiled_operations[key]
+
+
+def compile_field(parent_type: GraphQLObjectType, field_nodes: List[FieldNode]):
+    """
+    Returns (field_name, field_def, return_type, resolve, step)
+    where step is (field_name, serialize, non_null) for plain scalar fields, None otherwise.
+    """
+    field_name = field_nodes[0].name.value
+    field_def = parent_type.fields.get(field_name)
+    return_type = getattr(field_def, "type", None)
+    resolve = getattr(field_def, "resolve", None)
+    if not is_plain_scalar_field(field_name, field_def, field_nodes):
+        return field_name, field_def, return_type, resolve, None
+
+    serialize_type = return_type
+    non_null = isinstance(serialize_type, GraphQLNonNull)
+    if non_null:
+        serialize_type = serialize_type.of_type
+
+    step = (field_name, serialize_type.serialize, non_null)
+    return field_name, field_def, return_type, resolve, step
+
+
+def is_plain_scalar_field(field_name: str, field_def, field_nodes: List[FieldNode]):
+    if field_def is None or field_name.startswith("__"):
+        return False
+
+    if field_def.resolve is not None:
+        return False
+
+    if any(len(x.arguments or []) for x in field_nodes):
+        return False
+
+    return_type = field_def.type
+    if isinstance(return_type, GraphQLNonNull):
+        return_type = return_type.of_type
+
+    return is_leaf_type(return_type)
+
+
+def is_valid_compiled_field(parent_type: GraphQLObjectType, compiled):
+    field_name, field_def, return_type, resolve, _ = compiled
+    return parent_type.fields.get(field_name) is field_def and \
+        getattr(field_def, "type", None) is return_type and \
+        getattr(field_def, "resolve", None) is resolve
@@ -0,0 +1,17 @@
+from graphql_sync_dataloaders import DeferredExecutionContext
+
+from frappe_graphql.utils.resolver import bind_lazy_resolvers
+
+
+class FrappeExecutionContext(DeferredExecutionContext):
+    """
+    Binds the resolvers of DocType types on first use,
+    when the schema is built with lazy resolver binding.
+    Please see `utils.resolver.setup_default_resolvers`
+    """
+
+    def complete_object_value(self, return_type, field_nodes, info, path, result):
+        if getattr(return_type, "frappe_lazy_doctype", None):
+            bind_lazy_resolvers(return_type)
+
+        return super().complete_object_value(return_type, field_nodes, info, path, result)
@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+import frappe
+from frappe.utils import cint
+
+DEFAULT_DOCUMENT_CACHE_SIZE = 1000
+
+
+class DocumentCache(object):
+    """
+    A process-wide, size-bounded LRU of parsed & validated GraphQL Documents.
+
+    Entries are execution plans keyed by
+    (site, schema build id, depth limit, sha256 of query text)
+    so that a schema rebuild or a change in the depth limit never serves a stale
+    validation outcome.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry, maxsize: int):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self, site: str = None):
+        with self._lock:
+            if not site:
+                self._entries.clear()
+                return
+
+            for key in [k for k in self._entries if k[0] == site]:
+                del self._entries[key]
+
+    def info(self):
+        return frappe._dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._entries)
+        )
+
+
+document_cache = DocumentCache()
+
+
+def get_document_cache_size():
+    size = frappe.local.conf.get("frappe_graphql_document_cache_size")
+    if size is None:
+        return DEFAULT_DOCUMENT_CACHE_SIZE
+    return cint(size)
+
+
+def get_document_cache_key(schema, query_hash: str, max_depth: int):
+    return (
+        frappe.local.site,
+        getattr(schema, "frappe_build_id", id(schema)),
+        max_depth,
+        query_hash
+    )
+
+
+def clear_document_cache(site: str = None):
+    document_cache.clear(site=site)
+
+
+def get_document_cache_info():
+    return document_cache.info()
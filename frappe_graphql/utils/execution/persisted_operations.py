@@ -0,0 +1,111 @@
+import os
+import json
+import hashlib
+
+import frappe
+from frappe.utils import cint
+
+from . import build_execution_plan, get_max_depth
+
+"""
+Persisted Operations
+
+A registry of known operations, loaded from manifest files specified via the
+`graphql_persisted_operations` hook (paths relative to the app's root directory, like
+`graphql_sdl_dir`) and from `graphql_persisted_operations.json` in the site folder.
+
+Manifests are either a mapping of operation id to query text:
+    { "<operation-id>": "query GetUser { ... }" }
+or an Apollo persisted query manifest:
+    { "format": "apollo-persisted-query-manifest", "operations": [{ "id": .., "body": .. }] }
+
+Every registered operation is parsed, validated and depth-checked, and has its
+field trees precomputed once per schema build, so executing it skips all of that work.
+With the site config `frappe_graphql_persisted_operations_only: 1`, the graphql endpoint
+rejects every operation that is not registered.
+"""
+
+PERSISTED_OPERATIONS_HOOK = "graphql_persisted_operations"
+SITE_PERSISTED_OPERATIONS_FILE = "graphql_persisted_operations.json"
+
+persisted_operation_registries = {}
+
+
+def is_persisted_operations_only():
+    return cint(frappe.local.conf.get("frappe_graphql_persisted_operations_only"))
+
+
+def get_persisted_operation(schema, operation_id: str):
+    """
+    Returns the execution plan of the registered operation with the given id
+    """
+    return get_persisted_operations_registry(schema).operations.get(operation_id)
+
+
+def get_persisted_operation_by_hash(schema, query_hash: str):
+    """
+    Returns the execution plan of the registered operation with the given query text hash
+    """
+    return get_persisted_operations_registry(schema).by_hash.get(query_hash)
+
+
+def get_persisted_operations_registry(schema):
+    build_key = (getattr(schema, "frappe_build_id", id(schema)), get_max_depth())
+    registry = persisted_operation_registries.get(frappe.local.site)
+    if registry is not None and registry.build_key == build_key:
+        return registry
+
+    registry = frappe._dict(build_key=build_key, operations={}, by_hash={})
+    for operation_id, query in load_persisted_operations().items():
+        plan = build_execution_plan(schema=schema, query=query, precompute=True)
+        plan.persisted = True
+        plan.operation_id = operation_id
+        plan.query = query
+        if plan.errors:
+            frappe.log_error(
+                title="GraphQL Persisted Operation",
+                message=f"Persisted Operation '{operation_id}' is invalid: "
+                + ", ".join([x.message for x in plan.errors])
+            )
+
+        registry.operations[operation_id] = plan
+        registry.by_hash[hashlib.sha256(frappe.safe_encode(query)).hexdigest()] = plan
+
+    persisted_operation_registries[frappe.local.site] = registry
+    return registry
+
+
+def clear_persisted_operations_registry(site: str = None):
+    if not site:
+        persisted_operation_registries.clear()
+        return
+
+    persisted_operation_registries.pop(site, None)
+
+
+def load_persisted_operations():
+    paths = [
+        os.path.abspath(frappe.get_app_path("frappe", "../..", path))
+        for path in frappe.get_hooks(PERSISTED_OPERATIONS_HOOK)
+    ]
+    paths.append(os.path.abspath(frappe.get_site_path(SITE_PERSISTED_OPERATIONS_FILE)))
+
+    operations = {}
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+
+        operations.update(read_persisted_operations_manifest(path))
+
+    return operations
+
+
+def read_persisted_operations_manifest(path: str):
+    with open(path, "r") as f:
+        manifest = json.load(f)
+
+    if isinstance(manifest.get("operations"), list):
+        # apollo-persisted-query-manifest
+        return {x.get("id"): x.get("body") for x in manifest.get("operations")}
+
+    return manifest
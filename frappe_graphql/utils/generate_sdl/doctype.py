@@ -177,14 +177,25 @@ def get_query_type_extension(meta: Meta):
         plural_dt = format_doctype(plural)
         sdl += f"\n  {plural_dt}(filter: [DBFilterInput], sortBy: {dt}SortingInput, "
         sdl += "before: String, after: String, "
-        sdl += f"first: Int, last: Int): {dt}CountableConnection!"
+        sdl += f"first: Int, last: Int, countMode: CountMode): {dt}CountableConnection!"
+        sdl += f"\n  {plural_dt}Aggregate(filter: [DBFilterInput], groupBy: [String!], "
+        sdl += "metrics: [AggregateMetricInput!]!, limit: Int): [AggregateResult!]!"
 
     sdl += "\n}\n"
     return sdl
 
 
 def get_field_sdl(meta, docfield, options: dict, generated_enums: list = None):
-    return f"{docfield.fieldname}: {get_graphql_type(meta, docfield, options=options, generated_enums=generated_enums)}"
+    args = ""
+    if docfield.fieldtype in table_fields:
+        args = get_table_field_args_sdl()
+    graphql_type = get_graphql_type(
+        meta, docfield, options=options, generated_enums=generated_enums)
+    return f"{docfield.fieldname}{args}: {graphql_type}"
+
+
+def get_table_field_args_sdl():
+    return "(first: Int, after: Int, filter: [DBFilterInput], sortBy: ChildTableSortingInput)"
 
 
 def get_link_field_name_sdl(docfield):
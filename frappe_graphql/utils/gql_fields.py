@@ -1,5 +1,6 @@
 import jmespath
-from graphql import GraphQLResolveInfo
+from graphql import (GraphQLResolveInfo, DocumentNode, FieldNode, FragmentSpreadNode,
+                     InlineFragmentNode, FragmentDefinitionNode, OperationDefinitionNode)
 
 from mergedeep import merge, Strategy
 
@@ -7,6 +8,9 @@ from frappe_graphql.utils.introspection import is_introspection_key
 from frappe_graphql.utils import get_info_path_key
 from frappe_graphql.utils.permissions import get_allowed_fieldnames_for_doctype
 
+# info.context key under which precomputed field trees of the operation are made available
+FIELD_TREES_CONTEXT_KEY = "__field_trees__"
+
 
 def collect_fields(node: dict, fragments: dict):
     """
@@ -44,6 +48,8 @@ def collect_fields(node: dict, fragments: dict):
 def get_field_tree_dict(info: GraphQLResolveInfo):
     """
     A hierarchical dictionary of the graphql resolver fields nodes merged and returned.
+    Precomputed trees (see `get_document_field_trees`) are used when available,
+    and should be treated as read-only.
     Args:
         info (GraphQLResolveInfo): GraphqlResolver Info
     Returns:
@@ -54,6 +60,13 @@ def get_field_tree_dict(info: GraphQLResolveInfo):
                                    'totalSentiments': {}},
          'slug': {}}
     """
+    field_trees = info.context.get(FIELD_TREES_CONTEXT_KEY) \
+        if isinstance(info.context, dict) else None
+    if field_trees:
+        field_tree = (field_trees.get(id(info.operation)) or {}).get(get_info_path_key(info))
+        if field_tree is not None:
+            return field_tree
+
     fragments = {name: value.to_dict() for name, value in info.fragments.items()}
     fields = {}
     for field_node in info.field_nodes:
@@ -61,6 +74,84 @@ def get_field_tree_dict(info: GraphQLResolveInfo):
     return fields
 
 
+def get_document_field_trees(document: DocumentNode):
+    """
+    Precomputes the field tree (as returned by `get_field_tree_dict`) of every
+    field with a selection set in the document, so that they need not be worked
+    out from the AST on every execution.
+
+    Returns:
+        {id(OperationDefinitionNode): {info_path_key: field_tree}}
+    """
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+
+    field_trees = {}
+    for definition in document.definitions:
+        if not isinstance(definition, OperationDefinitionNode):
+            continue
+
+        operation_trees = field_trees[id(definition)] = {}
+        to_process = [([definition.selection_set], [])]
+        while len(to_process) > 0:
+            selection_sets, path = to_process.pop()
+
+            response_fields = {}
+            for selection_set in selection_sets:
+                _collect_response_fields(selection_set, fragments, response_fields)
+
+            for response_key, field_nodes in response_fields.items():
+                field_nodes = [x for x in field_nodes if x.selection_set]
+                if not len(field_nodes):
+                    continue
+
+                field_path = path + [response_key]
+                p_key = "-".join(field_path)
+                field_tree = operation_trees.setdefault(p_key, {})
+                for field_node in field_nodes:
+                    merge(field_tree, _collect_node_fields(field_node, fragments),
+                          strategy=Strategy.ADDITIVE)
+
+                to_process.append(([x.selection_set for x in field_nodes], field_path))
+
+    return field_trees
+
+
+def _collect_response_fields(selection_set, fragments: dict, response_fields: dict):
+    """
+    Groups the FieldNodes in the selection set by their response key,
+    the way they are grouped for execution
+    """
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            response_key = selection.alias.value if selection.alias else selection.name.value
+            response_fields.setdefault(response_key, []).append(selection)
+        elif isinstance(selection, InlineFragmentNode):
+            _collect_response_fields(selection.selection_set, fragments, response_fields)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = fragments.get(selection.name.value)
+            if fragment:
+                _collect_response_fields(fragment.selection_set, fragments, response_fields)
+
+
+def _collect_node_fields(node, fragments: dict):
+    """
+    Same as `collect_fields`, but works on the AST nodes directly
+    """
+    field = {}
+
+    if node.selection_set:
+        for leaf in node.selection_set.selections:
+            if isinstance(leaf, FieldNode):
+                field[leaf.name.value] = _collect_node_fields(leaf, fragments)
+            elif isinstance(leaf, FragmentSpreadNode):
+                field.update(_collect_node_fields(fragments[leaf.name.value], fragments))
+    return field
+
+
 def get_doctype_requested_fields(
     doctype: str,
     info: GraphQLResolveInfo,
@@ -94,6 +185,8 @@ def get_doctype_requested_fields(
     p_key = get_info_path_key(info)
     if jmespath_str:
         p_key += f"-{jmespath_str}"
+    # Dynamic Links resolve to different DocTypes on the same path
+    p_key += f"-{doctype}"
     requested_fields = info.context.get(p_key)
 
     if requested_fields is not None:
@@ -1,18 +1,19 @@
-from graphql import parse
+from graphql import DocumentNode, parse
 
 import frappe
 
 
-def get_masked_variables(query, variables):
+def get_masked_variables(query, variables, document: DocumentNode = None):
     """
     Return the variables dict with password field set to "******"
+    Pass in the already parsed `document` to avoid parsing the query again
     """
     if isinstance(variables, str):
         variables = frappe.parse_json(variables)
 
     variables = frappe._dict(variables)
     try:
-        document = parse(query)
+        document = document or parse(query)
         for operation_definition in (getattr(document, "definitions", None) or []):
             for variable in (getattr(operation_definition, "variable_definitions", None) or []):
                 variable_name = variable.variable.name.value
@@ -45,16 +46,18 @@ def get_masked_variables(query, variables):
     return variables
 
 
-def get_operation_name(query, operation_name):
+def get_operation_name(query, operation_name, document: DocumentNode = None):
     """
     Gets the active operation name
     if operation_name is not specified in the request,
     it will take on the first operation definition if available.
     Otherwise returns 'unnamed-query'
+
+    Pass in the already parsed `document` to avoid parsing the query again
     """
     defined_operations = []
     try:
-        document = parse(query)
+        document = document or parse(query)
         for operation_definition in document.definitions:
             if operation_definition.kind != "operation_definition":
                 continue
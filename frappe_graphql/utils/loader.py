@@ -1,43 +1,111 @@
 import os
+import time
 import frappe
-from typing import Generator
+from typing import Generator, List, Tuple
 
 import graphql
-from graphql import parse
+from graphql import parse, DocumentNode
 from graphql.error import GraphQLSyntaxError
 
 from .resolver import setup_default_resolvers
 from .exceptions import GraphQLFileSyntaxError
+from .execution.document_cache import clear_document_cache
+from .schema_registry import SchemaRegistry, get_schema_cache_size, get_schema_cache_max_bytes
+from .schema_patch import apply_schema_changes, set_schema_sync_state
+from .schema_snapshot import is_schema_snapshot_enabled, get_sources_hash, \
+    load_schema_snapshot, save_schema_snapshot
 
-graphql_schemas = {}
+graphql_schemas = SchemaRegistry()
 
 
 def get_schema():
     global graphql_schemas
 
-    if frappe.local.site in graphql_schemas:
-        return graphql_schemas.get(frappe.local.site)
+    schema = graphql_schemas.get(frappe.local.site)
+    # DocType changes are patched in, unless the schema has to be rebuilt
+    if schema is not None and apply_schema_changes(schema):
+        return schema
 
-    schema = graphql.build_schema(get_typedefs())
+    start = time.perf_counter()
+    schema = graphql.build_ast_schema(get_typedefs_document())
+    set_schema_sync_state(schema)
     setup_default_resolvers(schema=schema)
     execute_schema_processors(schema=schema)
 
-    graphql_schemas[frappe.local.site] = schema
+    # Parsed & validated documents are tied to the schema they were validated against
+    schema.frappe_build_id = frappe.generate_hash(length=10)
+    clear_document_cache(site=frappe.local.site)
+
+    evicted_sites = graphql_schemas.set(
+        frappe.local.site,
+        schema,
+        build_time=time.perf_counter() - start,
+        max_count=get_schema_cache_size(),
+        max_bytes=get_schema_cache_max_bytes(),
+    )
+    for site in evicted_sites:
+        # Cached documents hold on to the types of the evicted schema
+        clear_document_cache(site=site)
+
     return schema
 
 
+def get_typedefs_document() -> DocumentNode:
+    """
+    Returns the parsed typedefs, from the Schema Snapshot when the SDL files are unchanged
+    """
+    if not is_schema_snapshot_enabled():
+        return parse(get_typedefs())
+
+    sources = get_typedef_sources()
+    sources_hash = get_sources_hash(sources)
+    document = load_schema_snapshot(sources_hash)
+    if document is not None:
+        return document
+
+    for path, sdl in sources:
+        validate_graphql_sdl(path, sdl)
+
+    # Locations are not kept in snapshots
+    document = parse(join_typedef_sources(sources), no_location=True)
+    save_schema_snapshot(sources_hash, document)
+    return document
+
+
 def get_typedefs():
+    sources = get_typedef_sources()
+    for path, sdl in sources:
+        validate_graphql_sdl(path, sdl)
+
+    return join_typedef_sources(sources)
+
+
+def get_typedef_sources() -> List[Tuple[str, str]]:
+    """
+    Returns (path, sdl) of every graphql file, without parsing them
+    """
+    sources = []
     target_dir = frappe.get_site_path("doctype_sdls")
-    schema = load_schema_from_path(target_dir) if os.path.isdir(
-        target_dir) else ""
+    if os.path.isdir(target_dir):
+        sources.extend(get_graphql_file_sources(target_dir))
 
     for dir in frappe.get_hooks("graphql_sdl_dir"):
         dir = os.path.abspath(frappe.get_app_path("frappe", "../..", dir))
+        sources.extend(get_graphql_file_sources(dir))
 
-        schema += f"\n\n\n# {dir}\n\n"
-        schema += load_schema_from_path(dir)
+    return sources
 
-    return schema
+
+def join_typedef_sources(sources: List[Tuple[str, str]]) -> str:
+    return "\n".join([sdl for _, sdl in sources])
+
+
+def get_graphql_file_sources(path: str) -> List[Tuple[str, str]]:
+    if os.path.isdir(path):
+        return [(f, read_file(f)) for f in sorted(walk_graphql_files(path))]
+
+    path = os.path.abspath(path)
+    return [(path, read_file(path))]
 
 
 def execute_schema_processors(schema):
@@ -62,10 +130,18 @@ def walk_graphql_files(path: str) -> Generator[str, None, None]:
 
 
 def read_graphql_file(path: str) -> str:
+    schema = read_file(path)
+    validate_graphql_sdl(path, schema)
+    return schema
+
+
+def read_file(path: str) -> str:
     with open(path, "r") as graphql_file:
-        schema = graphql_file.read()
+        return graphql_file.read()
+
+
+def validate_graphql_sdl(path: str, schema: str):
     try:
         parse(schema)
     except GraphQLSyntaxError as e:
         raise GraphQLFileSyntaxError(path, str(e)) from e
-    return schema
@@ -0,0 +1,155 @@
+import re
+import hashlib
+
+from graphql import GraphQLError
+
+import frappe
+from frappe.utils import cint
+
+"""
+Automatic Persisted Queries (APQ)
+https://www.apollographql.com/docs/apollo-server/performance/apq/
+
+Clients send only the sha256 hash of the query in
+    extensions.persistedQuery.sha256Hash
+If the hash is unknown, `PersistedQueryNotFound` is returned and the client
+retries with both the hash and the full query text, which registers it in Redis.
+Only valid queries within the size limit are registered, the rest are executed as is.
+"""
+
+APQ_REDIS_KEY = "graphql_apq"
+APQ_DEFAULT_TTL = 7 * 24 * 60 * 60  # a week
+APQ_DEFAULT_MAX_QUERY_SIZE = 64 * 1024  # bytes
+
+SHA256_HASH_PATTERN = re.compile(r"^[a-f0-9]{64}$")
+
+
+class PersistedQueryError(GraphQLError):
+    error_code = "PERSISTED_QUERY_ERROR"
+    http_status_code = 400
+
+    def __init__(self, message):
+        super().__init__(message, extensions={"code": self.error_code})
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    error_code = "PERSISTED_QUERY_NOT_FOUND"
+    http_status_code = 404
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    error_code = "PERSISTED_QUERY_NOT_SUPPORTED"
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+class PersistedOperationNotAllowed(PersistedQueryError):
+    error_code = "PERSISTED_OPERATION_NOT_ALLOWED"
+    http_status_code = 403
+
+    def __init__(self):
+        super().__init__("Only persisted operations are allowed")
+
+
+class PersistedQueryHashMismatch(PersistedQueryError):
+    error_code = "PERSISTED_QUERY_HASH_MISMATCH"
+
+    def __init__(self):
+        super().__init__("provided sha does not match query")
+
+
+def resolve_persisted_query(query, extensions):
+    """
+    Returns the query text for the request.
+    - Hash of a Persisted Operation: Returns the registered operation
+    - Query & Hash: Verifies the hash and registers the query
+    - Only Hash: Looks up the registered query
+    - No Hash: Returns the query as is
+    """
+    from frappe_graphql import get_schema
+    from frappe_graphql.utils.execution.persisted_operations import get_persisted_operation, \
+        is_persisted_operations_only
+
+    if isinstance(extensions, str):
+        extensions = frappe.parse_json(extensions)
+
+    persisted_query = (extensions or {}).get("persistedQuery")
+    if not persisted_query:
+        return query
+
+    if cint(persisted_query.get("version")) != 1:
+        raise PersistedQueryNotSupported()
+
+    operation_id = persisted_query.get("sha256Hash")
+    persisted_operation = get_persisted_operation(
+        schema=get_schema(), operation_id=operation_id) if operation_id else None
+    if persisted_operation is not None:
+        return persisted_operation.query
+
+    if is_persisted_operations_only():
+        # Only registered operations are allowed, nothing gets registered via APQ
+        if query:
+            return query
+        raise PersistedQueryNotFound()
+
+    if is_apq_disabled():
+        raise PersistedQueryNotSupported()
+
+    sha256_hash = str(persisted_query.get("sha256Hash") or "").lower()
+    if not SHA256_HASH_PATTERN.match(sha256_hash):
+        raise PersistedQueryNotFound()
+
+    if query:
+        if get_query_hash(query) != sha256_hash:
+            raise PersistedQueryHashMismatch()
+
+        if is_query_registrable(query):
+            frappe.cache().set_value(
+                get_apq_redis_key(sha256_hash), query, expires_in_sec=get_apq_ttl())
+        return query
+
+    query = frappe.cache().get_value(get_apq_redis_key(sha256_hash))
+    if not query:
+        raise PersistedQueryNotFound()
+
+    return query
+
+
+def is_query_registrable(query: str):
+    """
+    Guests can register queries too, so only the queries that are within the size limit
+    and pass validation are kept in Redis. The plan is cached, so the request reuses it.
+    """
+    from frappe_graphql import get_schema
+    from frappe_graphql.utils.execution import get_execution_plan
+
+    if len(frappe.safe_encode(query)) > get_apq_max_query_size():
+        return False
+
+    plan = get_execution_plan(schema=get_schema(), query=query)
+    return not plan.errors
+
+
+def get_query_hash(query: str):
+    return hashlib.sha256(frappe.safe_encode(query)).hexdigest()
+
+
+def get_apq_redis_key(sha256_hash: str):
+    return f"{APQ_REDIS_KEY}|{sha256_hash}"
+
+
+def get_apq_ttl():
+    return cint(frappe.local.conf.get("frappe_graphql_apq_ttl")) or APQ_DEFAULT_TTL
+
+
+def get_apq_max_query_size():
+    return cint(frappe.local.conf.get("frappe_graphql_apq_max_query_size")) \
+        or APQ_DEFAULT_MAX_QUERY_SIZE
+
+
+def is_apq_disabled():
+    return cint(frappe.local.conf.get("frappe_graphql_disable_apq"))
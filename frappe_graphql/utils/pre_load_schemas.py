@@ -1,24 +1,148 @@
-def pre_load_schemas():
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+
+def pre_load_schemas(processes: int = None):
     """
     Can be called in https://docs.gunicorn.org/en/stable/settings.html#pre-fork
     to pre-load the all sites schema's on all workers.
+
+    The SDL of every site is parsed in a process pool, each process writing the
+    site's Schema Snapshot (please see `utils.schema_snapshot`). The schemas are then
+    built from the snapshots in the master, before fork, so that the workers share
+    them copy-on-write.
+
+    Resolvers are bound to Python callables, so built schemas cannot be sent across
+    processes. Only the parsed SDL is. When Schema Snapshots are disabled, there is nothing
+    to warm up in parallel & the pool is skipped.
+
+    At most `frappe_graphql_schema_cache_size` schemas are loaded, so that the
+    Schema Registry does not evict the schemas loaded first.
+
+    Returns the report of each site ({site: {status, warmup_time, load_time, error}}),
+    which is logged to the `frappe_graphql` logger as well. Printing it is up to the caller.
     """
-    from frappe.utils import get_sites
-    from frappe import init_site, init, connect, get_installed_apps, destroy
-    with init_site():
-        sites = get_sites()
+    options = get_pre_load_options()
+    sites = options.sites
+    report = {site: dict(site=site) for site in sites}
+
+    if options.max_schemas and len(sites) > options.max_schemas:
+        for site in sites[options.max_schemas:]:
+            report[site].update(status="skipped")
+        sites = sites[:options.max_schemas]
+
+    start = time.perf_counter()
+    if options.snapshot_enabled:
+        with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as executor:
+            for result in executor.map(warm_site_schema_snapshot, sites):
+                report[result["site"]].update(result)
+    else:
+        for site in sites:
+            report[site].update(status="ok")
+    warmup_time = time.perf_counter() - start
 
     for site in sites:
-        import frappe
+        if report[site].get("status") != "ok":
+            continue
+
+        report[site].update(load_site_schema(site))
+
+    log_pre_load_report(list(report.values()), warmup_time)
+    return report
+
+
+def get_pre_load_options():
+    """
+    Sites & the options set in common_site_config.json
+    """
+    import frappe
+    from frappe.utils import cint, get_sites
+
+    with frappe.init_site():
+        return frappe._dict(
+            sites=list(get_sites()),
+            snapshot_enabled=not cint(
+                frappe.local.conf.get("frappe_graphql_disable_schema_snapshot")),
+            max_schemas=cint(frappe.local.conf.get("frappe_graphql_schema_cache_size")),
+        )
+
+
+def warm_site_schema_snapshot(site: str):
+    """
+    Runs in the process pool
+    """
+    import frappe
+    from frappe_graphql.utils.loader import get_typedefs_document
+    from frappe_graphql.utils.schema_snapshot import is_schema_snapshot_enabled
+
+    result = dict(site=site, status="ok")
+    start = time.perf_counter()
+    try:
+        frappe.local.initialised = False
+        frappe.init(site=site)
+        frappe.connect(site)
+        if "frappe_graphql" not in frappe.get_installed_apps():
+            result["status"] = "skipped"
+            return result
+
+        if is_schema_snapshot_enabled():
+            get_typedefs_document()
+    except Exception:
+        result["status"] = "failed"
+        result["error"] = traceback.format_exc()
+    finally:
+        result["warmup_time"] = time.perf_counter() - start
+        frappe.destroy()
+
+    return result
+
+
+def load_site_schema(site: str):
+    """
+    Builds the site's schema in the current process
+    """
+    import frappe
+    from frappe_graphql import get_schema
+
+    result = dict(status="ok")
+    start = time.perf_counter()
+    try:
         frappe.local.initialised = False
-        init(site=site)
-        connect(site)
-        if "frappe_graphql" not in get_installed_apps():
+        frappe.init(site=site)
+        frappe.connect(site)
+        get_schema()
+    except Exception:
+        result["status"] = "failed"
+        result["error"] = traceback.format_exc()
+    finally:
+        result["load_time"] = time.perf_counter() - start
+        frappe.destroy()
+
+    return result
+
+
+def log_pre_load_report(report: list, warmup_time: float):
+    import frappe
+
+    logger = frappe.logger("frappe_graphql")
+    loaded = [x for x in report if x.get("status") == "ok"]
+    failed = [x for x in report if x.get("status") == "failed"]
+
+    lines = [
+        f"GraphQL Schemas: {len(loaded)} loaded, {len(failed)} failed, "
+        f"{len(report) - len(loaded) - len(failed)} skipped "
+        f"(parallel warmup: {warmup_time:.2f}s)"
+    ]
+    for x in report:
+        if x.get("status") == "skipped":
             continue
-        try:
-            from frappe_graphql import get_schema
-            get_schema()
-        except Exception:
-            print(f"Failed to build schema for site {site}")
-        finally:
-            destroy()
+
+        lines.append(f"  {x['site']}: {x.get('status')} "
+                     f"(warmup: {x.get('warmup_time', 0):.2f}s, "
+                     f"load: {x.get('load_time', 0):.2f}s)")
+
+    logger.info("\n".join(lines))
+    for x in failed:
+        logger.error(f"Failed to build schema for site {x['site']}\n{x.get('error')}")
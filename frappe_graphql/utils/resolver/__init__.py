@@ -1,3 +1,5 @@
+import threading
+
 from graphql import (
     GraphQLSchema, GraphQLType, GraphQLResolveInfo,
     GraphQLNonNull, GraphQLObjectType
@@ -5,19 +7,22 @@ from graphql import (
 
 import frappe
 from frappe.model.meta import Meta
+from frappe.utils import cint
 
 from .root_query import setup_root_query_resolvers
 from .link_field import setup_link_field_resolvers
 from .select_fields import setup_select_field_resolvers
 from .child_tables import setup_child_table_resolvers
 from .translate import setup_translatable_resolvers
-from .utils import get_singular_doctype
+from .utils import get_singular_doctype, get_frappe_doctype
+
+lazy_binding_lock = threading.RLock()
 
 
 def setup_default_resolvers(schema: GraphQLSchema):
     setup_root_query_resolvers(schema=schema)
 
-    doctype_resolver_processors = frappe.get_hooks("doctype_resolver_processors")
+    lazy = is_lazy_resolver_binding()
 
     # Setup custom resolvers for DocTypes
     for type_name, gql_type in schema.type_map.items():
@@ -25,20 +30,67 @@ def setup_default_resolvers(schema: GraphQLSchema):
         if not dt or not isinstance(gql_type, GraphQLObjectType):
             continue
 
-        meta = frappe.get_meta(dt)
+        if lazy:
+            # Bound on first use during execution. Please see `bind_lazy_resolvers`
+            gql_type.frappe_lazy_doctype = dt
+            continue
+
+        setup_doctype_resolvers(frappe.get_meta(dt), gql_type)
+
 
-        setup_frappe_df(meta, gql_type)
-        setup_doctype_resolver(meta, gql_type)
-        setup_link_field_resolvers(meta, gql_type)
-        setup_select_field_resolvers(meta, gql_type)
-        setup_child_table_resolvers(meta, gql_type)
-        setup_translatable_resolvers(meta, gql_type)
+def setup_doctype_resolvers(meta: Meta, gql_type: GraphQLObjectType):
+    setup_frappe_doctype(meta, gql_type)
+    setup_frappe_df(meta, gql_type)
+    setup_doctype_resolver(meta, gql_type)
+    setup_link_field_resolvers(meta, gql_type)
+    setup_select_field_resolvers(meta, gql_type)
+    setup_child_table_resolvers(meta, gql_type)
+    setup_translatable_resolvers(meta, gql_type)
 
-        # Wrap all the resolvers set above with a mandatory-checker
-        setup_mandatory_resolver(meta, gql_type)
+    # Wrap all the resolvers set above with a mandatory-checker
+    setup_mandatory_resolver(meta, gql_type)
 
-        for cmd in doctype_resolver_processors:
-            frappe.get_attr(cmd)(meta=meta, gql_type=gql_type)
+    for cmd in frappe.get_hooks("doctype_resolver_processors"):
+        frappe.get_attr(cmd)(meta=meta, gql_type=gql_type)
+
+
+def is_lazy_resolver_binding():
+    """
+    With the site config `frappe_graphql_lazy_resolvers: 1`, DocType resolvers are bound
+    only when the type is first resolved, instead of for every DocType at schema build
+    """
+    return cint(frappe.local.conf.get("frappe_graphql_lazy_resolvers"))
+
+
+def bind_lazy_resolvers(gql_type: GraphQLObjectType):
+    """
+    Sets up the default resolvers of a DocType type that was left unbound at schema build.
+    Resolvers set on the type by `graphql_schema_processors` in the meantime are kept,
+    the same way they override the default resolvers when bound at schema build.
+    """
+    with lazy_binding_lock:
+        dt = getattr(gql_type, "frappe_lazy_doctype", None)
+        if not dt:
+            return
+
+        custom_resolvers = {
+            fieldname: field.resolve
+            for fieldname, field in gql_type.fields.items()
+            if field.resolve is not None
+        }
+
+        setup_doctype_resolvers(frappe.get_meta(dt), gql_type)
+        for fieldname, resolve in custom_resolvers.items():
+            gql_type.fields[fieldname].resolve = resolve
+
+        gql_type.frappe_lazy_doctype = None
+
+
+def setup_frappe_doctype(meta: Meta, gql_type: GraphQLType):
+    """
+    Sets up the DocType info on the GraphQLObjectType as `frappe_doctype`
+    """
+    gql_type.frappe_doctype = get_frappe_doctype(meta.name)
 
 
 def setup_frappe_df(meta: Meta, gql_type: GraphQLType):
@@ -98,5 +150,8 @@ def setup_mandatory_resolver(meta: Meta, gql_type: GraphQLType):
 
 
 def _doctype_resolver(obj, info: GraphQLResolveInfo, **kwargs):
-    dt = get_singular_doctype(info.parent_type.name)
-    return dt
+    frappe_doctype = getattr(info.parent_type, "frappe_doctype", None)
+    if frappe_doctype:
+        return frappe_doctype.name
+
+    return get_singular_doctype(info.parent_type.name)
@@ -5,7 +5,6 @@ from frappe.model.meta import Meta
 from .dataloaders import get_child_table_loader
 from .utils import get_frappe_df_from_resolve_info
 from ..gql_fields import get_doctype_requested_fields
-from .. import get_info_path_key
 
 
 def setup_child_table_resolvers(meta: Meta, gql_type: GraphQLType):
@@ -20,7 +19,8 @@ def setup_child_table_resolvers(meta: Meta, gql_type: GraphQLType):
 def _child_table_resolver(obj, info: GraphQLResolveInfo, **kwargs):
     # If the obj already has a non None value, we can return it.
     # This happens when the resolver returns a full doc
-    if obj.get(info.field_name) is not None:
+    # Rows are fetched again when first / after / filter / sortBy are specified
+    if obj.get(info.field_name) is not None and not kwargs:
         return obj.get(info.field_name)
 
     df = get_frappe_df_from_resolve_info(info)
@@ -30,7 +30,6 @@ def _child_table_resolver(obj, info: GraphQLResolveInfo, **kwargs):
     return get_child_table_loader(
         child_doctype=df.options,
         parent_doctype=df.parent,
-        parentfield=df.fieldname,
-        path=get_info_path_key(info),
-        fields=get_doctype_requested_fields(df.options, info, {"parent"}, df.parent)
-    ).load(obj.get("name"))
+        fields=get_doctype_requested_fields(df.options, info, {"parent"}, df.parent),
+        args=kwargs
+    ).load((obj.get("name"), df.fieldname))
@@ -1,60 +1,178 @@
 from collections import OrderedDict
-from typing import List
+from typing import List, Tuple, Union
 
 import frappe
+from frappe.model import default_fields
+from graphql import GraphQLError
 
+from frappe_graphql.utils.cursor_pagination import process_filters
+from frappe_graphql.utils.db import get_windowed_query
 from frappe_graphql.utils.permissions import get_allowed_fieldnames_for_doctype
 from .frappe_dataloader import FrappeDataloader
 from .locals import get_loader_from_locals, set_loader_in_locals
 
 
-def get_child_table_loader(child_doctype: str, parent_doctype: str, parentfield: str,
-                           path: str = None, fields: List[str] = None) -> FrappeDataloader:
-    locals_key = (child_doctype, parent_doctype, parentfield)
-    if path:
-        # incase alias usage
-        locals_key = locals_key + (path,)
+def get_child_table_loader(child_doctype: str, parent_doctype: str, parentfield: str = None,
+                           path: str = None, fields: List[str] = None,
+                           args: dict = None) -> Union[FrappeDataloader, "TableFieldLoader"]:
+    """
+    Returns the loader of the child DocType under the parent DocType.
+    Keys are (parent, parentfield) & each resolves to the list of rows, ordered by idx.
+    When parentfield is specified, plain parent names can be loaded as well, as before.
+
+    There is a single loader per (child_doctype, parent_doctype), so that all the table fields
+    sharing the child DocType (eg: multiple tables of Sales Taxes and Charges), along with their
+    aliases & paths, are fetched in a single query with the union of the fields requested.
+
+    Parameters:
+        child_doctype: the child doctype
+        parent_doctype: the parent doctype
+        parentfield: the table field plain parent names are loaded for
+        path: no longer required, loaders are shared across paths
+        fields: fields to fetch. All the permitted fields are fetched when not specified
+        args: table field arguments (first, after, filter, sortBy).
+            Parents loaded with the same arguments are fetched together
+    """
+    locals_key = (child_doctype, parent_doctype)
+    if args:
+        locals_key = locals_key + (frappe.as_json(args),)
     loader = get_loader_from_locals(locals_key)
-    if loader:
-        return loader
-
-    loader = FrappeDataloader(_get_child_table_loader_fn(
-        child_doctype=child_doctype,
-        parent_doctype=parent_doctype,
-        parentfield=parentfield,
-        fields=fields
-    ))
-    set_loader_in_locals(locals_key, loader)
+    if not loader:
+        loader = ChildTableDataloader(
+            child_doctype=child_doctype, parent_doctype=parent_doctype, args=args)
+        set_loader_in_locals(locals_key, loader)
+
+    loader.add_fields(fields)
+    if parentfield:
+        return TableFieldLoader(loader, parentfield)
+
     return loader
 
 
-def _get_child_table_loader_fn(child_doctype: str, parent_doctype: str, parentfield: str,
-                               fields: List[str] = None):
-    def _inner(keys):
-        fieldnames = fields or get_allowed_fieldnames_for_doctype(
-            doctype=child_doctype,
-            parent_doctype=parent_doctype
-        )
+class TableFieldLoader:
+    """
+    Loads the rows of a single table field through the shared ChildTableDataloader.
+    Plain parent names are paired with the parentfield
+    """
 
-        rows = frappe.get_all(
-            doctype=child_doctype,
-            fields=fieldnames,
-            filters=dict(
-                parenttype=parent_doctype,
-                parentfield=parentfield,
-                parent=("in", keys),
-            ),
-            order_by="idx asc")
+    def __init__(self, loader: "ChildTableDataloader", parentfield: str):
+        self.loader = loader
+        self.parentfield = parentfield
+
+    def get_key(self, key):
+        return key if isinstance(key, tuple) else (key, self.parentfield)
+
+    def load(self, key):
+        return self.loader.load(self.get_key(key))
+
+    def clear(self, key):
+        self.loader.clear(self.get_key(key))
+
+
+class ChildTableDataloader(FrappeDataloader):
+    def __init__(self, child_doctype: str, parent_doctype: str, args: dict = None):
+        self.child_doctype = child_doctype
+        self.parent_doctype = parent_doctype
+        self.args = frappe._dict(args or {})
+        self.fields = {}  # ordered set
+        self.all_fields = False
+        super().__init__(self._load_rows)
+
+    def add_fields(self, fields: List[str] = None):
+        if not fields:
+            self.all_fields = True
+            return
+
+        for fieldname in fields:
+            self.fields[fieldname] = True
+
+    def _load_rows(self, keys: List[Tuple[str, str]]):
+        if self.all_fields:
+            fieldnames = list(get_allowed_fieldnames_for_doctype(
+                doctype=self.child_doctype,
+                parent_doctype=self.parent_doctype
+            ))
+        else:
+            fieldnames = list(self.fields)
+
+        # Rows are split by (parent, parentfield)
+        for fieldname in ("parent", "parentfield"):
+            if fieldname not in fieldnames:
+                fieldnames.append(fieldname)
+
+        parents = list(OrderedDict.fromkeys(parent for parent, _ in keys))
+        parentfields = list(OrderedDict.fromkeys(parentfield for _, parentfield in keys))
+
+        filters = [
+            ["parenttype", "=", self.parent_doctype],
+            ["parent", "in", parents],
+            ["parentfield", "in", parentfields],
+        ]
+
+        if self.args:
+            rows = self._get_windowed_rows(fieldnames, filters)
+        else:
+            rows = frappe.get_all(
+                doctype=self.child_doctype,
+                fields=fieldnames,
+                filters=filters,
+                order_by="idx asc")
 
         _results = OrderedDict()
         for k in keys:
             _results[k] = []
 
         for row in rows:
-            if row.parent not in _results:
+            k = (row.parent, row.parentfield)
+            if k not in _results:
                 continue
-            _results.get(row.parent).append(row)
+            _results.get(k).append(row)
+
+        return [_results[k] for k in keys]
+
+    def _get_windowed_rows(self, fieldnames: List[str], filters: list):
+        """
+        first / after are applied per (parent, parentfield), via ROW_NUMBER()
+        `after` is the number of rows to skip
+        """
+        first = self.args.get("first")
+        after = self.args.get("after") or 0
+        if first is not None and first < 0:
+            raise GraphQLError("Argument `first` must be a non-negative integer.")
+        if after < 0:
+            raise GraphQLError("Argument `after` must be a non-negative integer.")
+        if first == 0:
+            return []
+
+        sort_field, sort_dir = self.get_sort_args()
+        for fieldname in (sort_field, "idx"):
+            if fieldname not in fieldnames:
+                fieldnames.append(fieldname)
+
+        query = frappe.get_all(
+            doctype=self.child_doctype,
+            fields=fieldnames,
+            filters=[*filters, *process_filters(self.args.get("filter") or [])],
+            order_by="idx asc",
+            run=0)
+
+        return frappe.db.sql(get_windowed_query(
+            query,
+            partition_by=["parent", "parentfield"],
+            order_by=[(sort_field, sort_dir), ("idx", "asc")],
+            offset=after,
+            limit=first
+        ), as_dict=True)
+
+    def get_sort_args(self):
+        sorting_input = self.args.get("sortBy")
+        if not sorting_input or not sorting_input.get("field"):
+            return "idx", "asc"
 
-        return _results.values()
+        sort_field = sorting_input.get("field")
+        meta = frappe.get_meta(self.child_doctype)
+        if sort_field not in default_fields and sort_field not in meta.get_valid_columns():
+            raise GraphQLError(f"Invalid sort field: {sort_field}")
 
-    return _inner
+        sort_dir = (sorting_input.get("direction") or "asc").lower()
+        return sort_field, sort_dir
@@ -3,49 +3,98 @@ import frappe
 from .frappe_dataloader import FrappeDataloader
 from frappe_graphql.utils.permissions import get_allowed_fieldnames_for_doctype
 from .locals import get_loader_from_locals, set_loader_in_locals
+from .link_cache import is_link_cache_enabled, get_cached_documents, set_cached_documents
 
 
 def get_doctype_dataloader(doctype: str, path: str = None,
                            fields: List[str] = None) -> FrappeDataloader:
     """
+    Returns the loader of the DocType.
+    There is a single loader per DocType, so that keys loaded from all the paths
+    (owner & modified_by on the same rows, same DocType via different Link fields, aliases)
+    are batched into a single query with the union of the fields requested.
+
     Parameters:
         doctype: the doctype
-        path: pass the graphql info path if your dataloader is used multiple time using aliases
-        fields: fields to fetch
+        path: no longer required, loaders are shared across paths
+        fields: fields to fetch. All the permitted fields are fetched when not specified
     """
-    key = doctype
-    if path:
-        key += f"-{path}"
-    loader = get_loader_from_locals(key)
-    if loader:
-        return loader
-
-    loader = FrappeDataloader(_get_document_loader_fn(doctype=doctype, fields=fields))
-    set_loader_in_locals(key, loader)
+    loader = get_loader_from_locals(doctype)
+    if not loader:
+        loader = DocTypeDataloader(doctype=doctype)
+        set_loader_in_locals(doctype, loader)
+
+    loader.add_fields(fields)
     return loader
 
 
-def _get_document_loader_fn(doctype: str, fields: List[str] = None):
-    fieldnames = fields or get_allowed_fieldnames_for_doctype(doctype)
+class DocTypeDataloader(FrappeDataloader):
+    def __init__(self, doctype: str):
+        self.doctype = doctype
+        self.fields = {}  # ordered set
+        self.all_fields = False
+        super().__init__(self._load_documents)
+
+    def add_fields(self, fields: List[str] = None):
+        if not fields:
+            self.all_fields = True
+            return
+
+        for fieldname in fields:
+            self.fields[fieldname] = True
+
+    def _load_documents(self, keys: List[str]):
+        if self.all_fields:
+            fieldnames = get_allowed_fieldnames_for_doctype(self.doctype)
+        else:
+            fieldnames = ["name", *[x for x in self.fields if x != "name"]]
+
+        use_link_cache = is_link_cache_enabled(self.doctype)
+        cached_docs = get_cached_documents(
+            self.doctype, keys, fieldnames) if use_link_cache else {}
+        missing_keys = [k for k in keys if k not in cached_docs]
+
+        docs = list(cached_docs.values())
+        if missing_keys:
+            fetched_docs = frappe.get_list(
+                doctype=self.doctype,
+                filters=[["name", "IN", missing_keys]],
+                fields=fieldnames,
+                limit_page_length=len(missing_keys) + 1
+            )
+            if use_link_cache:
+                set_cached_documents(self.doctype, fetched_docs, fieldnames)
+            docs.extend(fetched_docs)
+
+        return align_documents_to_keys(keys, docs)
+
+
+def align_documents_to_keys(keys: List[str], docs: List[dict]) -> List[dict]:
+    """
+    Returns the docs in the order of keys, None for keys without a doc.
+
+    MariaDB compares names case-insensitively & ignores trailing spaces, so
+    `IN ("administrator")` fetches the doc named "Administrator". Keys are matched
+    exactly first & then the same way MariaDB does. Duplicate keys get the same doc.
+    """
+    exact_map = {}
+    folded_map = {}
+    for doc in docs:
+        exact_map.setdefault(doc.name, doc)
+        folded_map.setdefault(_fold_name(doc.name), doc)
 
-    def _load_documents(keys: List[str]):
-        docs = frappe.get_list(
-            doctype=doctype,
-            filters=[["name", "IN", keys]],
-            fields=fieldnames,
-            limit_page_length=len(keys) + 1
-        )
+    sorted_docs = []
+    for k in keys:
+        doc = exact_map.get(k)
+        if doc is None and isinstance(k, str):
+            doc = folded_map.get(_fold_name(k))
+        sorted_docs.append(doc)
 
-        sorted_docs = []
-        for k in keys:
-            doc = [x for x in docs if x.name == k]
-            if not len(doc):
-                sorted_docs.append(None)
-                continue
+    return sorted_docs
 
-            sorted_docs.append(doc[0])
-            docs.remove(doc[0])
 
-        return sorted_docs
+def _fold_name(name):
+    if not isinstance(name, str):
+        return name
 
-    return _load_documents
+    return name.rstrip(" ").casefold()
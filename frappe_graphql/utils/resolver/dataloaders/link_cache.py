@@ -0,0 +1,183 @@
+import pickle
+import hashlib
+from typing import Dict, List
+
+import frappe
+from frappe.utils import cint
+
+from frappe_graphql.utils.execution.document_cache import DocumentCache
+
+"""
+Link Cache
+
+Master data (User, Company, Currency, UOM..) is resolved via Link fields on almost every
+request, but rarely changes. The DocTypes listed in the site config
+    "frappe_graphql_link_cache_doctypes": ["User", "Currency"]
+are cached across requests, in a process-wide LRU & optionally in Redis
+(`frappe_graphql_link_cache_redis: 1`), keyed by (doctype, name, fields).
+
+Every DocType has a version stamp in Redis that is bumped on any change to its documents
+(doc_events on_change / on_trash), which invalidates all its cached entries.
+Documents updated without doc events (eg: frappe.db.set_value) are not picked up until
+the entries expire from Redis / get evicted from the LRU.
+
+The cache is used only when the current user can read every document of the DocType
+(read permission without any match conditions / user permissions), since the rows are
+shared between users. The fields requested are already restricted to the user's permlevels.
+"""
+
+LINK_CACHE_VERSIONS_REDIS_KEY = "graphql_link_cache_versions"
+LINK_CACHE_REDIS_KEY = "graphql_link_cache"
+DEFAULT_LINK_CACHE_SIZE = 10000
+DEFAULT_LINK_CACHE_TTL = 60 * 60
+
+link_cache = DocumentCache()
+
+
+def get_link_cache_doctypes():
+    return frappe.local.conf.get("frappe_graphql_link_cache_doctypes") or []
+
+
+def is_link_cache_enabled(doctype: str):
+    """
+    Checks if the doctype is cached & the current user can use the shared entries.
+    Checked once per request per doctype.
+    """
+    if doctype not in get_link_cache_doctypes():
+        return False
+
+    if not hasattr(frappe.local, "graphql_link_cache_access"):
+        frappe.local.graphql_link_cache_access = {}
+
+    key = (frappe.session.user, doctype)
+    if key not in frappe.local.graphql_link_cache_access:
+        frappe.local.graphql_link_cache_access[key] = bool(
+            frappe.has_permission(doctype, "read")
+            and not frappe.build_match_conditions(doctype)
+        )
+
+    return frappe.local.graphql_link_cache_access[key]
+
+
+def get_cached_documents(doctype: str, names: List[str], fields: List[str]) -> Dict[str, dict]:
+    """
+    Returns {name: doc} of the names found in the cache
+    """
+    version = get_link_cache_version(doctype)
+    fields_key = get_fields_key(fields)
+
+    docs = {}
+    missing = []
+    for name in names:
+        doc = link_cache.get((frappe.local.site, doctype, name, fields_key, version))
+        if doc is None:
+            missing.append(name)
+        else:
+            docs[name] = frappe._dict(doc)
+
+    if missing and is_link_cache_redis_enabled():
+        redis_key = get_link_cache_redis_key(doctype, version, fields_key)
+        values = frappe.cache().hmget(frappe.cache().make_key(redis_key), missing)
+        for name, value in zip(missing, values):
+            if value is None:
+                continue
+
+            doc = pickle.loads(value)
+            set_process_cache(doctype, name, fields_key, version, doc)
+            docs[name] = frappe._dict(doc)
+
+    return docs
+
+
+def set_cached_documents(doctype: str, docs: List[dict], fields: List[str]):
+    version = get_link_cache_version(doctype)
+    fields_key = get_fields_key(fields)
+
+    for doc in docs:
+        set_process_cache(doctype, doc.name, fields_key, version, frappe._dict(doc))
+
+    if docs and is_link_cache_redis_enabled():
+        redis_key = frappe.cache().make_key(
+            get_link_cache_redis_key(doctype, version, fields_key))
+        pipeline = frappe.cache().pipeline()
+        pipeline.hset(redis_key, mapping={
+            doc.name: pickle.dumps(frappe._dict(doc), protocol=pickle.HIGHEST_PROTOCOL)
+            for doc in docs
+        })
+        pipeline.expire(redis_key, get_link_cache_ttl())
+        pipeline.execute()
+
+
+def set_process_cache(doctype: str, name: str, fields_key: str, version: str, doc: dict):
+    link_cache.set(
+        (frappe.local.site, doctype, name, fields_key, version),
+        doc,
+        maxsize=get_link_cache_size()
+    )
+
+
+def get_link_cache_version(doctype: str):
+    """
+    The version stamp of the doctype, checked once per request
+    """
+    if not hasattr(frappe.local, "graphql_link_cache_versions"):
+        frappe.local.graphql_link_cache_versions = {}
+
+    version = frappe.local.graphql_link_cache_versions.get(doctype)
+    if version:
+        return version
+
+    version = frappe.cache().hget(LINK_CACHE_VERSIONS_REDIS_KEY, doctype)
+    if not version:
+        version = bump_link_cache_version(doctype)
+
+    frappe.local.graphql_link_cache_versions[doctype] = version
+    return version
+
+
+def bump_link_cache_version(doctype: str):
+    version = frappe.generate_hash(length=10)
+    frappe.cache().hset(LINK_CACHE_VERSIONS_REDIS_KEY, doctype, version)
+
+    if hasattr(frappe.local, "graphql_link_cache_versions"):
+        frappe.local.graphql_link_cache_versions[doctype] = version
+
+    return version
+
+
+def invalidate_link_cache(doc, method=None):
+    """
+    doc_events handler, on_change & on_trash of every DocType
+    """
+    if doc.doctype not in get_link_cache_doctypes():
+        return
+
+    bump_link_cache_version(doc.doctype)
+
+    after_commit = getattr(frappe.db, "after_commit", None)
+    if after_commit is not None:
+        # Documents cached by other requests before this transaction was committed
+        after_commit.add(lambda: bump_link_cache_version(doc.doctype))
+
+
+def get_fields_key(fields: List[str]):
+    return hashlib.md5(frappe.safe_encode(",".join(sorted(fields)))).hexdigest()
+
+
+def get_link_cache_redis_key(doctype: str, version: str, fields_key: str):
+    return f"{LINK_CACHE_REDIS_KEY}|{doctype}|{version}|{fields_key}"
+
+
+def get_link_cache_size():
+    size = frappe.local.conf.get("frappe_graphql_link_cache_size")
+    if size is None:
+        return DEFAULT_LINK_CACHE_SIZE
+    return cint(size)
+
+
+def get_link_cache_ttl():
+    return cint(frappe.local.conf.get("frappe_graphql_link_cache_ttl")) or DEFAULT_LINK_CACHE_TTL
+
+
+def is_link_cache_redis_enabled():
+    return cint(frappe.local.conf.get("frappe_graphql_link_cache_redis"))
@@ -5,7 +5,6 @@ from frappe.model.meta import Meta
 from .dataloaders import get_doctype_dataloader
 from .utils import get_frappe_df_from_resolve_info
 from ..gql_fields import get_doctype_requested_fields
-from .. import get_info_path_key
 
 
 def setup_link_field_resolvers(meta: Meta, gql_type: GraphQLType):
@@ -47,9 +46,7 @@ def _resolve_link_field(obj, info: GraphQLResolveInfo, **kwargs):
         return None
 
     # Permission check is done within get_doctype_dataloader via get_list
-    return get_doctype_dataloader(dt,
-                                  get_info_path_key(info),
-                                  get_doctype_requested_fields(dt, info)).load(dn)
+    return get_doctype_dataloader(dt, fields=get_doctype_requested_fields(dt, info)).load(dn)
 
 
 def _resolve_dynamic_link_field(obj, info: GraphQLResolveInfo, **kwargs):
@@ -65,10 +62,11 @@ def _resolve_dynamic_link_field(obj, info: GraphQLResolveInfo, **kwargs):
     if not dn:
         return None
 
+    # Loaders are shared per DocType, so the (dt, dn) pairs of a whole level are grouped
+    # by DocType & fetched with one query per distinct DocType in the same dispatch round,
+    # along with the Link fields pointing to the same DocType.
     # Permission check is done within get_doctype_dataloader via get_list
-    return get_doctype_dataloader(
-        dt, get_info_path_key(info),
-        get_doctype_requested_fields(dt, info)).load(dn)
+    return get_doctype_dataloader(dt, fields=get_doctype_requested_fields(dt, info)).load(dn)
 
 
 def _resolve_link_name_field(obj, info: GraphQLResolveInfo, **kwargs):
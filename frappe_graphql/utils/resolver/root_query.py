@@ -4,8 +4,12 @@ import frappe
 from frappe.model.meta import is_single
 
 from frappe_graphql import CursorPaginator
+from frappe_graphql.utils.aggregation import get_aggregates
 
-from .utils import get_singular_doctype, get_plural_doctype
+from .utils import get_singular_doctype, get_plural_doctype, get_frappe_doctype
+
+
+AGGREGATE_SUFFIX = "Aggregate"
 
 
 def setup_root_query_resolvers(schema: GraphQLSchema):
@@ -15,6 +19,7 @@ def setup_root_query_resolvers(schema: GraphQLSchema):
     Query {
         User(name: ID): User!
         Users(**args: CursorArgs): UserCountableConnection!
+        UsersAggregate(**args: AggregateArgs): [AggregateResult!]!
     }
     """
 
@@ -22,17 +27,45 @@ def setup_root_query_resolvers(schema: GraphQLSchema):
         dt = get_singular_doctype(fieldname)
         if dt:
             field.resolve = _get_doc_resolver
+            field.frappe_doctype = get_frappe_doctype(dt, is_plural=False)
             continue
 
         dt = get_plural_doctype(fieldname)
         if dt:
             field.resolve = _doc_cursor_resolver
+            field.frappe_doctype = get_frappe_doctype(dt, is_plural=True)
+            continue
+
+        dt = get_aggregate_doctype(fieldname)
+        if dt:
+            field.resolve = _doc_aggregate_resolver
+            field.frappe_doctype = get_frappe_doctype(dt, is_plural=True)
+
+
+def get_aggregate_doctype(fieldname: str):
+    if not fieldname.endswith(AGGREGATE_SUFFIX):
+        return None
+
+    return get_plural_doctype(fieldname[:-len(AGGREGATE_SUFFIX)])
+
+
+def get_root_field_doctype(info: GraphQLResolveInfo):
+    """
+    Returns the DocType info bound to the root field at schema build
+    """
+    return getattr(info.parent_type.fields[info.field_name], "frappe_doctype", None)
 
 
 def _get_doc_resolver(obj, info: GraphQLResolveInfo, **kwargs):
-    dt = get_singular_doctype(info.field_name)
-    if is_single(dt):
-        kwargs["name"] = dt
+    frappe_doctype = get_root_field_doctype(info)
+    if frappe_doctype:
+        dt = frappe_doctype.name
+        if frappe_doctype.issingle:
+            kwargs["name"] = dt
+    else:
+        dt = get_singular_doctype(info.field_name)
+        if is_single(dt):
+            kwargs["name"] = dt
 
     dn = kwargs["name"]
     if not frappe.has_permission(doctype=dt, doc=dn):
@@ -44,10 +77,28 @@ def _get_doc_resolver(obj, info: GraphQLResolveInfo, **kwargs):
 
 
 def _doc_cursor_resolver(obj, info: GraphQLResolveInfo, **kwargs):
-    plural_doctype = get_plural_doctype(info.field_name)
+    frappe_doctype = get_root_field_doctype(info)
+    plural_doctype = frappe_doctype.name if frappe_doctype else get_plural_doctype(info.field_name)
 
     frappe.has_permission(
         doctype=plural_doctype,
         throw=True)
 
     return CursorPaginator(doctype=plural_doctype).resolve(obj, info, **kwargs)
+
+
+def _doc_aggregate_resolver(obj, info: GraphQLResolveInfo, **kwargs):
+    frappe_doctype = get_root_field_doctype(info)
+    doctype = frappe_doctype.name if frappe_doctype else get_aggregate_doctype(info.field_name)
+
+    frappe.has_permission(
+        doctype=doctype,
+        throw=True)
+
+    return get_aggregates(
+        doctype,
+        filters=kwargs.get("filter"),
+        group_by=kwargs.get("groupBy"),
+        metrics=kwargs.get("metrics"),
+        limit=kwargs.get("limit")
+    )
@@ -0,0 +1,128 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql.graphql import execute
+
+
+class TestChildTableLoader(TestCase):
+    def test_aliases_fetched_in_single_query(self):
+        with patch.object(frappe, "get_all", wraps=frappe.get_all) as get_all:
+            r = execute(query="""
+            query {
+                Users(first: 5) {
+                    edges {
+                        node {
+                            name
+                            roles { role }
+                            all_roles: roles { name role idx }
+                        }
+                    }
+                }
+            }
+            """)
+
+        self.assertIsNone(r.get("errors"))
+        calls = [x for x in get_all.call_args_list if x.kwargs.get("doctype") == "Has Role"]
+        self.assertEqual(len(calls), 1)
+
+        # Merged field sets
+        fields = calls[0].kwargs.get("fields")
+        for fieldname in ("name", "role", "idx", "parent", "parentfield"):
+            self.assertIn(fieldname, fields)
+
+        for edge in r.get("data").get("Users").get("edges"):
+            node = edge.get("node")
+            self.assertEqual(
+                [x.get("role") for x in node.get("roles")],
+                [x.get("role") for x in node.get("all_roles")]
+            )
+
+    def test_split_by_parentfield(self):
+        from frappe_graphql.utils.resolver.dataloaders.child_table_loader import \
+            ChildTableDataloader
+
+        loader = ChildTableDataloader(child_doctype="Has Role", parent_doctype="User")
+        loader.add_fields(["role"])
+        rows = [
+            frappe._dict(parent="a", parentfield="roles", role="x"),
+            frappe._dict(parent="a", parentfield="other_roles", role="y"),
+            frappe._dict(parent="b", parentfield="roles", role="z"),
+        ]
+        with patch.object(frappe, "get_all", return_value=rows) as get_all:
+            results = loader._load_rows([("a", "roles"), ("a", "other_roles"), ("c", "roles")])
+
+        self.assertEqual(get_all.call_count, 1)
+        self.assertIn(
+            ["parentfield", "in", ["roles", "other_roles"]],
+            get_all.call_args.kwargs.get("filters")
+        )
+        self.assertEqual([[x.role for x in r] for r in results], [["x"], ["y"], []])
+
+    def test_table_field_args(self):
+        r = execute(query="""
+        query {
+            Users(first: 10) {
+                edges {
+                    node {
+                        name
+                        roles { role }
+                        first_roles: roles(first: 2, sortBy: {field: "role", direction: DESC}) {
+                            role
+                        }
+                        next_roles: roles(first: 2, after: 2,
+                                          sortBy: {field: "role", direction: DESC}) {
+                            role
+                        }
+                        filtered_roles: roles(filter: [
+                            {fieldname: "role", operator: EQ, value: "System Manager"}
+                        ]) {
+                            role
+                        }
+                    }
+                }
+            }
+        }
+        """)
+        self.assertIsNone(r.get("errors"))
+
+        for edge in r.get("data").get("Users").get("edges"):
+            node = edge.get("node")
+            roles = sorted([x.get("role") for x in node.get("roles")], reverse=True)
+            self.assertEqual([x.get("role") for x in node.get("first_roles")], roles[:2])
+            self.assertEqual([x.get("role") for x in node.get("next_roles")], roles[2:4])
+            self.assertEqual(
+                [x.get("role") for x in node.get("filtered_roles")],
+                [x for x in roles if x == "System Manager"]
+            )
+
+    def test_invalid_sort_field(self):
+        r = execute(query="""
+        query {
+            Users(first: 1) {
+                edges {
+                    node {
+                        roles(first: 1, sortBy: {field: "1; drop", direction: ASC}) { role }
+                    }
+                }
+            }
+        }
+        """)
+        self.assertIsNotNone(r.get("errors"))
+
+    def test_load_parent_name_with_parentfield(self):
+        from frappe_graphql.utils.resolver.dataloaders import get_child_table_loader
+
+        loader = get_child_table_loader(
+            child_doctype="Has Role", parent_doctype="User", parentfield="roles",
+            fields=["role"])
+        future = loader.load("Administrator")
+        loader.loader.dispatch_queue()
+        rows = future.result()
+        self.assertEqual(
+            [x.role for x in rows],
+            frappe.get_all("Has Role", filters={
+                "parenttype": "User", "parent": "Administrator", "parentfield": "roles"},
+                pluck="role", order_by="idx asc")
+        )
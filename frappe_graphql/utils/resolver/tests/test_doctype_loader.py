@@ -0,0 +1,102 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql.utils.resolver.dataloaders.doctype_loader import align_documents_to_keys
+
+
+class TestDocTypeLoader(TestCase):
+    def test_alignment(self):
+        docs = [frappe._dict(name="b"), frappe._dict(name="a")]
+        self.assertEqual(
+            align_documents_to_keys(["a", "b", "c"], docs),
+            [docs[1], docs[0], None]
+        )
+
+    def test_duplicate_keys(self):
+        docs = [frappe._dict(name="a")]
+        self.assertEqual(align_documents_to_keys(["a", "a"], docs), [docs[0], docs[0]])
+
+    def test_case_insensitive_names(self):
+        admin = frappe._dict(name="Administrator")
+        guest = frappe._dict(name="Guest")
+        self.assertEqual(
+            align_documents_to_keys(["administrator", "Administrator", "GUEST "], [admin, guest]),
+            [admin, admin, guest]
+        )
+
+    def test_exact_match_is_preferred(self):
+        upper, lower = frappe._dict(name="ABC"), frappe._dict(name="abc")
+        self.assertEqual(align_documents_to_keys(["abc", "ABC"], [upper, lower]), [lower, upper])
+
+    def test_linear_lookups(self):
+        from frappe_graphql.utils.resolver.dataloaders import doctype_loader
+
+        n = 1000
+        docs = [frappe._dict(name=f"DOC-{i:06d}") for i in range(n)]
+        keys = [doc.name.lower() for doc in reversed(docs)]
+        with patch.object(doctype_loader, "_fold_name", wraps=doctype_loader._fold_name) as fold:
+            self.assertEqual(align_documents_to_keys(keys, docs), list(reversed(docs)))
+
+        # Folded once per doc & once per key that does not match exactly
+        self.assertEqual(fold.call_count, 2 * n)
+
+    def test_batched_across_paths(self):
+        from frappe_graphql.graphql import execute
+        from frappe_graphql.utils.resolver.dataloaders import doctype_loader
+
+        with patch.object(doctype_loader, "align_documents_to_keys",
+                          wraps=align_documents_to_keys) as align:
+            r = execute(query="""
+            query {
+                Users(first: 5) {
+                    edges {
+                        node {
+                            name
+                            owner { name }
+                            modified_by { name full_name }
+                        }
+                    }
+                }
+            }
+            """)
+
+        self.assertIsNone(r.get("errors"))
+        # owner & modified_by are fetched in a single query, with the union of the fields
+        self.assertEqual(align.call_count, 1)
+        node = r.get("data").get("Users").get("edges")[0].get("node")
+        self.assertIsNotNone(node.get("modified_by").get("full_name"))
+
+    def test_dynamic_links_grouped_by_doctype(self):
+        from frappe_graphql.graphql import execute
+        from frappe_graphql.utils.resolver.dataloaders import doctype_loader
+
+        with patch.object(doctype_loader, "align_documents_to_keys",
+                          wraps=align_documents_to_keys) as align:
+            r = execute(query="""
+            query {
+                Users(first: 5) {
+                    edges {
+                        node {
+                            name
+                            owner { name }
+                            roles {
+                                role { name }
+                                parent {
+                                    name
+                                    ... on User { full_name }
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+            """)
+
+        self.assertIsNone(r.get("errors"))
+        # User (owner), then Role (roles.role) & User (roles.parent) in the next round
+        self.assertEqual(align.call_count, 3)
+        roles = r.get("data").get("Users").get("edges")[0].get("node").get("roles")
+        for role in roles:
+            self.assertIsNotNone(role.get("parent").get("full_name"))
@@ -0,0 +1,46 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql.cache import clear_cache
+from frappe_graphql.utils.resolver.utils import get_singular_doctype, get_plural_doctype
+
+
+class TestDocTypeMaps(TestCase):
+    def test_maps(self):
+        self.assertEqual(get_singular_doctype("User"), "User")
+        self.assertEqual(get_plural_doctype("Users"), "User")
+        self.assertIsNone(get_singular_doctype("Unknown"))
+
+    def test_memoized_per_process(self):
+        get_singular_doctype("User")
+        get_plural_doctype("Users")
+
+        with patch.object(frappe.cache(), "get_value") as get_value:
+            for _ in range(100):
+                self.assertEqual(get_singular_doctype("User"), "User")
+                self.assertEqual(get_plural_doctype("Users"), "User")
+
+            get_value.assert_not_called()
+
+    def test_clear_cache_invalidates(self):
+        get_singular_doctype("User")
+        clear_cache()
+
+        with patch("frappe_graphql.utils.resolver.utils.get_singular_doctype_map",
+                   return_value=frappe._dict(User="User")) as get_map:
+            get_singular_doctype("User")
+            get_singular_doctype("User")
+            get_map.assert_called_once()
+
+    def test_doctype_bound_at_schema_build(self):
+        from frappe_graphql import get_schema
+        schema = get_schema()
+
+        self.assertEqual(schema.get_type("User").frappe_doctype.name, "User")
+        self.assertEqual(schema.get_type("HasRole").frappe_doctype.istable, 1)
+
+        users_field = schema.query_type.fields["Users"]
+        self.assertEqual(users_field.frappe_doctype.name, "User")
+        self.assertTrue(users_field.frappe_doctype.is_plural)
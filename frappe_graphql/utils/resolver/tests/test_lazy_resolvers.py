@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+import frappe
+
+from frappe_graphql import get_schema
+from frappe_graphql.graphql import execute
+from frappe_graphql.utils.loader import graphql_schemas
+
+ADMIN_QUERY = """
+query {
+    User(name: "Administrator") {
+        name
+        doctype
+        full_name
+        roles {
+            role__name
+            role {
+                name
+            }
+        }
+    }
+}
+"""
+
+
+class TestLazyResolvers(TestCase):
+    def tearDown(self) -> None:
+        frappe.local.conf.pop("frappe_graphql_lazy_resolvers", None)
+        graphql_schemas.pop(frappe.local.site, None)
+
+    def test_resolvers_are_bound_on_first_use(self):
+        expected = execute(query=ADMIN_QUERY)
+
+        frappe.local.conf.frappe_graphql_lazy_resolvers = 1
+        graphql_schemas.pop(frappe.local.site, None)
+        schema = get_schema()
+
+        self.assertEqual(schema.get_type("User").frappe_lazy_doctype, "User")
+        self.assertEqual(schema.get_type("Role").frappe_lazy_doctype, "Role")
+        self.assertEqual(schema.get_type("DocType").frappe_lazy_doctype, "DocType")
+
+        self.assertEqual(execute(query=ADMIN_QUERY), expected)
+        self.assertIsNone(schema.get_type("User").frappe_lazy_doctype)
+        self.assertIsNone(schema.get_type("HasRole").frappe_lazy_doctype)
+        self.assertIsNone(schema.get_type("Role").frappe_lazy_doctype)
+
+        # Untouched types are left unbound
+        self.assertEqual(schema.get_type("DocType").frappe_lazy_doctype, "DocType")
@@ -0,0 +1,77 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql.graphql import execute
+from frappe_graphql.utils.resolver.dataloaders.link_cache import link_cache, \
+    invalidate_link_cache
+
+QUERY = """
+query {
+    Users(first: 5) {
+        edges {
+            node {
+                name
+                owner { name full_name }
+            }
+        }
+    }
+}
+"""
+
+
+class TestLinkCache(TestCase):
+    def setUp(self) -> None:
+        link_cache.clear()
+        frappe.local.conf.frappe_graphql_link_cache_doctypes = ["User"]
+
+    def tearDown(self) -> None:
+        link_cache.clear()
+        frappe.local.conf.pop("frappe_graphql_link_cache_doctypes", None)
+        frappe.set_user("Administrator")
+
+    def get_user_loads(self):
+        with patch.object(frappe, "get_list", wraps=frappe.get_list) as get_list:
+            r = execute(query=QUERY)
+            self.assertIsNone(r.get("errors"))
+
+        return len([
+            x for x in get_list.call_args_list
+            if x.kwargs.get("doctype") == "User" and x.kwargs.get("filters")
+            and x.kwargs.get("filters")[0][0] == "name"
+        ])
+
+    def test_links_are_served_from_cache(self):
+        self.assertEqual(self.get_user_loads(), 1)
+        self.assertEqual(self.get_user_loads(), 0)
+
+    def test_invalidated_on_change(self):
+        self.assertEqual(self.get_user_loads(), 1)
+
+        frappe.get_doc("User", "Administrator").save(ignore_permissions=True)
+        self.assertEqual(self.get_user_loads(), 1)
+
+    def test_invalidated_after_commit(self):
+        callbacks = []
+        after_commit = type("AfterCommit", (), {"add": lambda self, fn: callbacks.append(fn)})()
+
+        self.assertEqual(self.get_user_loads(), 1)
+        with patch.object(frappe.db, "after_commit", after_commit, create=True):
+            invalidate_link_cache(frappe.get_doc("User", "Administrator"))
+
+        # Cached by a concurrent request before the commit
+        self.assertEqual(self.get_user_loads(), 1)
+        self.assertEqual(self.get_user_loads(), 0)
+
+        for fn in callbacks:
+            fn()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.get_user_loads(), 1)
+
+    def test_restricted_users_skip_cache(self):
+        self.assertEqual(self.get_user_loads(), 1)
+
+        with patch("frappe.build_match_conditions", return_value="`tabUser`.name = 'x'"):
+            frappe.local.graphql_link_cache_access = {}
+            self.assertEqual(self.get_user_loads(), 1)
@@ -1,15 +1,73 @@
 from graphql import GraphQLResolveInfo
 
 import frappe
+from frappe.utils import cint
 
 from frappe_graphql.utils.permissions import is_field_permlevel_restricted_for_doctype
 
 
 SINGULAR_DOCTYPE_MAP_REDIS_KEY = "singular_doctype_graphql_map"
 PLURAL_DOCTYPE_MAP_REDIS_KEY = "plural_doctype_graphql_map"
+DOCTYPE_MAP_VERSION_REDIS_KEY = "doctype_graphql_map_version"
+
+# Per-process copies of the doctype maps, keyed by site
+# { site: frappe._dict(version=str, singular=dict, plural=dict) }
+doctype_maps = {}
 
 
 def get_singular_doctype(name):
+    maps = get_doctype_maps()
+    if maps.singular is None:
+        maps.singular = get_singular_doctype_map()
+
+    return maps.singular.get(name, None)
+
+
+def get_plural_doctype(name):
+    maps = get_doctype_maps()
+    if maps.plural is None:
+        maps.plural = get_plural_doctype_map()
+
+    return maps.plural.get(name, None)
+
+
+def get_doctype_maps():
+    """
+    The doctype maps are kept in Redis & memoized per process.
+    The memoized maps are dropped whenever the version in Redis changes,
+    which is checked only once per request.
+    """
+    version = get_doctype_map_version()
+    maps = doctype_maps.get(frappe.local.site)
+    if maps is None or maps.version != version:
+        maps = frappe._dict(version=version, singular=None, plural=None, doctypes=None)
+        doctype_maps[frappe.local.site] = maps
+
+    return maps
+
+
+def get_doctype_map_version():
+    version = getattr(frappe.local, "graphql_doctype_map_version", None)
+    if version:
+        return version
+
+    version = frappe.cache().get_value(DOCTYPE_MAP_VERSION_REDIS_KEY)
+    if not version:
+        version = bump_doctype_map_version()
+
+    frappe.local.graphql_doctype_map_version = version
+    return version
+
+
+def bump_doctype_map_version():
+    version = frappe.generate_hash(length=10)
+    frappe.cache().set_value(DOCTYPE_MAP_VERSION_REDIS_KEY, version)
+    frappe.local.graphql_doctype_map_version = version
+    doctype_maps.pop(frappe.local.site, None)
+    return version
+
+
+def get_singular_doctype_map():
     singular_map = frappe.cache().get_value(SINGULAR_DOCTYPE_MAP_REDIS_KEY)
     if not singular_map:
         import inflect
@@ -31,10 +89,10 @@ def get_singular_doctype(name):
 
         frappe.cache().set_value(SINGULAR_DOCTYPE_MAP_REDIS_KEY, singular_map)
 
-    return singular_map.get(name, None)
+    return singular_map
 
 
-def get_plural_doctype(name):
+def get_plural_doctype_map():
     plural_map = frappe.cache().get_value(PLURAL_DOCTYPE_MAP_REDIS_KEY)
     if not plural_map:
         import inflect
@@ -46,7 +104,28 @@ def get_plural_doctype(name):
 
         frappe.cache().set_value(PLURAL_DOCTYPE_MAP_REDIS_KEY, plural_map)
 
-    return plural_map.get(name, None)
+    return plural_map
+
+
+def get_frappe_doctype(doctype: str, **kwargs):
+    """
+    DocType info bound onto GraphQLObjectTypes & root GraphQLFields as `frappe_doctype`
+    at schema build, so that resolvers need not look it up at runtime
+    """
+    maps = get_doctype_maps()
+    if maps.doctypes is None:
+        # Avoids loading the Meta of every DocType at schema build
+        maps.doctypes = {
+            x.name: x for x in frappe.get_all("DocType", fields=["name", "istable", "issingle"])
+        }
+
+    info = maps.doctypes.get(doctype) or frappe._dict()
+    return frappe._dict(
+        name=doctype,
+        istable=cint(info.istable),
+        issingle=cint(info.issingle),
+        **kwargs
+    )
 
 
 def get_frappe_df_from_resolve_info(info: GraphQLResolveInfo):
@@ -0,0 +1,288 @@
+import os
+import threading
+
+from graphql import (GraphQLSchema, GraphQLObjectType, GraphQLEnumType, GraphQLEnumValue,
+                     GraphQLField, GraphQLArgument, EnumTypeDefinitionNode, FieldDefinitionNode,
+                     ObjectTypeDefinitionNode, ObjectTypeExtensionNode, parse, print_ast,
+                     type_from_ast, value_from_ast)
+from graphql.pyutils import Undefined
+
+import frappe
+from frappe.utils import cint
+
+from .execution.document_cache import clear_document_cache
+
+"""
+Incremental Schema Updates
+
+When a DocType, Custom Field or Property Setter changes, the SDL of the DocType is
+regenerated (`generate_sdl.doctype.get_doctype_sdl`) & written to the site's doctype_sdls.
+The change is recorded in Redis along with a new schema version. Clearing the cache of the
+site records a full rebuild the same way (please see `bump_schema_version`).
+
+Every worker checks the schema version once per request. For each DocType changed since
+its schema was built, the GraphQLObjectType of the DocType is patched in place:
+- Fields that are unchanged are kept as is (along with their resolvers)
+- New / changed fields are added & get their default resolvers set up
+- Removed fields are dropped
+- Fields added by other SDLs (`extend type`) or graphql_schema_processors are kept as is
+- Enums (Select Fields, Sort Fields) are updated
+
+Only DocTypes whose SDL is generated into the site's doctype_sdls are patched.
+When a rebuild is recorded, or when a patch is not possible (eg: a Link to a DocType
+that is not in the schema), the schema is rebuilt from scratch.
+"""
+
+SCHEMA_VERSION_REDIS_KEY = "graphql_schema_version"
+SCHEMA_CHANGES_REDIS_KEY = "graphql_schema_changes"
+# Field of SCHEMA_CHANGES_REDIS_KEY stamped when the whole schema has to be rebuilt
+SCHEMA_REBUILD_FIELD = "__rebuild"
+
+schema_patch_lock = threading.RLock()
+
+
+def on_doctype_schema_change(doc, method=None):
+    """
+    doc_events handler for DocType, Custom Field & Property Setter
+    """
+    doctype = get_changed_doctype(doc)
+    if not doctype or frappe.flags.in_install or frappe.flags.in_migrate:
+        return
+
+    after_commit = getattr(frappe.db, "after_commit", None)
+    if after_commit is not None:
+        # Other workers should see the updated Meta once they pick up the change
+        after_commit.add(lambda: record_schema_change(doctype))
+    else:
+        record_schema_change(doctype)
+
+
+def get_changed_doctype(doc):
+    if doc.doctype == "DocType":
+        return doc.name
+    elif doc.doctype == "Custom Field":
+        return doc.dt
+    elif doc.doctype == "Property Setter":
+        return doc.doc_type
+
+
+def record_schema_change(doctype: str):
+    if not os.path.isfile(get_doctype_sdl_path(doctype)):
+        return
+
+    write_doctype_sdl(doctype)
+    bump_schema_version(doctype=doctype)
+
+
+def bump_schema_version(doctype: str = None):
+    """
+    Makes every worker patch the type of the DocType into its schema,
+    or rebuild the schema of the site altogether when no DocType is specified
+    """
+    frappe.cache().hset(
+        SCHEMA_CHANGES_REDIS_KEY, doctype or SCHEMA_REBUILD_FIELD, frappe.generate_hash(length=10))
+    frappe.cache().set_value(SCHEMA_VERSION_REDIS_KEY, frappe.generate_hash(length=10))
+
+    # Let get_schema pick up the change within this request as well
+    frappe.local.graphql_schema_version_checked = False
+
+
+def get_doctype_sdl_path(doctype: str):
+    return frappe.get_site_path("doctype_sdls", f"{frappe.scrub(doctype)}.graphql")
+
+
+def get_sdl_options():
+    return frappe._dict(
+        disable_enum_select_fields=cint(
+            frappe.local.conf.get("frappe_graphql_disable_enum_select_fields")),
+        ignore_custom_fields=False
+    )
+
+
+def write_doctype_sdl(doctype: str):
+    from .generate_sdl.doctype import get_doctype_sdl
+
+    sdl = get_doctype_sdl(doctype=doctype, options=get_sdl_options())
+    with open(get_doctype_sdl_path(doctype), "w") as f:
+        f.write(sdl)
+
+
+def set_schema_sync_state(schema: GraphQLSchema):
+    """
+    Marks a freshly built schema as up to date with the changes recorded so far
+    """
+    schema.frappe_schema_version = frappe.cache().get_value(SCHEMA_VERSION_REDIS_KEY)
+    schema.frappe_schema_changes = dict(frappe.cache().hgetall(SCHEMA_CHANGES_REDIS_KEY) or {})
+    frappe.local.graphql_schema_version_checked = True
+
+
+def apply_schema_changes(schema: GraphQLSchema):
+    """
+    Patches the schema with the DocType changes recorded since it was built.
+    Checked once per request.
+
+    Returns False if the schema has to be rebuilt from scratch
+    """
+    if getattr(frappe.local, "graphql_schema_version_checked", False):
+        return True
+
+    version = frappe.cache().get_value(SCHEMA_VERSION_REDIS_KEY)
+    frappe.local.graphql_schema_version_checked = True
+    if version == getattr(schema, "frappe_schema_version", None):
+        return True
+
+    with schema_patch_lock:
+        if version == schema.frappe_schema_version:
+            return True
+
+        changes = frappe.cache().hgetall(SCHEMA_CHANGES_REDIS_KEY) or {}
+        if changes.get(SCHEMA_REBUILD_FIELD) != \
+                schema.frappe_schema_changes.get(SCHEMA_REBUILD_FIELD):
+            return False
+
+        patched = False
+        for doctype, stamp in changes.items():
+            if doctype == SCHEMA_REBUILD_FIELD or \
+                    schema.frappe_schema_changes.get(doctype) == stamp:
+                continue
+
+            if not patch_doctype_type(schema, doctype):
+                return False
+
+            schema.frappe_schema_changes[doctype] = stamp
+            patched = True
+
+        if patched:
+            # Parsed & validated documents are tied to the schema they were validated against
+            schema.frappe_build_id = frappe.generate_hash(length=10)
+            clear_document_cache(site=frappe.local.site)
+
+        schema.frappe_schema_version = version
+
+    return True
+
+
+def patch_doctype_type(schema: GraphQLSchema, doctype: str):
+    """
+    Patches the GraphQLObjectType of the DocType with its regenerated SDL.
+    Returns False if the type could not be patched
+    """
+    from .generate_sdl.doctype import get_doctype_sdl, format_doctype
+    from .resolver import setup_doctype_resolvers, setup_frappe_df
+
+    gql_type = schema.get_type(format_doctype(doctype))
+    if not isinstance(gql_type, GraphQLObjectType):
+        return False
+
+    document = parse(get_doctype_sdl(doctype=doctype, options=get_sdl_options()))
+
+    for node in document.definitions:
+        if isinstance(node, EnumTypeDefinitionNode):
+            patch_enum_type(schema, node)
+
+    type_nodes = [
+        node
+        for node in document.definitions
+        if isinstance(node, (ObjectTypeDefinitionNode, ObjectTypeExtensionNode))
+        and node.name.value == gql_type.name
+    ]
+
+    # Fields generated from the DocType SDL the type was built / last patched with.
+    # The rest were added via `extend type` or by graphql_schema_processors
+    sdl_fieldnames = set(
+        field_node.name.value for field_node in getattr(gql_type.ast_node, "fields", None) or [])
+
+    fields = {}
+    new_fields = {}
+    for field_node in [field_node for node in type_nodes for field_node in node.fields]:
+        fieldname = field_node.name.value
+        existing_field = gql_type.fields.get(fieldname)
+        if existing_field is not None and is_field_unchanged(schema, existing_field, field_node):
+            fields[fieldname] = existing_field
+            continue
+
+        field = build_field(schema, field_node)
+        if field is None:
+            return False
+
+        fields[fieldname] = new_fields[fieldname] = field
+
+    for fieldname, field in gql_type.fields.items():
+        if fieldname not in fields and fieldname not in sdl_fieldnames:
+            fields[fieldname] = field
+
+    gql_type.fields = fields
+    gql_type.ast_node = next(
+        (x for x in type_nodes if isinstance(x, ObjectTypeDefinitionNode)), gql_type.ast_node)
+
+    if getattr(gql_type, "frappe_lazy_doctype", None):
+        # Resolvers are bound on first use
+        return True
+
+    meta = frappe.get_meta(doctype)
+    if len(new_fields):
+        setup_doctype_resolvers(meta, GraphQLObjectType(gql_type.name, fields=new_fields))
+
+    # Refresh the DocFields of the unchanged fields as well
+    setup_frappe_df(meta, gql_type)
+    return True
+
+
+def is_field_unchanged(schema: GraphQLSchema, field: GraphQLField,
+                       field_node: FieldDefinitionNode):
+    if field.ast_node is not None:
+        return print_ast(field.ast_node) == print_ast(field_node)
+
+    return str(field.type) == str(type_from_ast(schema, field_node.type)) and \
+        set(field.args) == set(x.name.value for x in field_node.arguments or [])
+
+
+def build_field(schema: GraphQLSchema, field_node: FieldDefinitionNode):
+    """
+    Builds the GraphQLField of the FieldDefinitionNode (along with its args & description)
+    against the types of the live schema. Returns None if a type is not in the schema
+    """
+    field_type = type_from_ast(schema, field_node.type)
+    if field_type is None:
+        return None
+
+    args = {}
+    for arg_node in field_node.arguments or []:
+        arg_type = type_from_ast(schema, arg_node.type)
+        if arg_type is None:
+            return None
+
+        args[arg_node.name.value] = GraphQLArgument(
+            arg_type,
+            default_value=value_from_ast(arg_node.default_value, arg_type)
+            if arg_node.default_value else Undefined,
+            description=arg_node.description.value if arg_node.description else None,
+            ast_node=arg_node
+        )
+
+    return GraphQLField(
+        field_type,
+        args=args,
+        description=field_node.description.value if field_node.description else None,
+        ast_node=field_node
+    )
+
+
+def patch_enum_type(schema: GraphQLSchema, node: EnumTypeDefinitionNode):
+    values = {
+        value_node.name.value: GraphQLEnumValue(value_node.name.value, ast_node=value_node)
+        for value_node in node.values
+    }
+
+    enum_type = schema.get_type(node.name.value)
+    if enum_type is None:
+        schema.type_map[node.name.value] = GraphQLEnumType(
+            node.name.value, values, ast_node=node)
+        return
+
+    if not isinstance(enum_type, GraphQLEnumType):
+        return
+
+    # Updated in place, since the fields & inputs refer to the same GraphQLEnumType
+    enum_type.values = values
+    enum_type.__dict__.pop("_value_lookup", None)
@@ -0,0 +1,161 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from graphql import (GraphQLSchema, GraphQLNamedType, GraphQLField, GraphQLArgument,
+                     GraphQLInputField, GraphQLEnumValue, GraphQLWrappingType, GraphQLDirective)
+from graphql.language import Node
+
+import frappe
+from frappe.utils import cint, flt
+
+
+class SchemaRegistry(object):
+    """
+    A process-wide LRU of the GraphQLSchemas of each site.
+
+    Entries are dropped when
+    - the registry holds more schemas than `frappe_graphql_schema_cache_size`
+    - the schemas take up more than `frappe_graphql_schema_cache_max_mb` (approximately)
+
+    Invalidation of the schemas held (DocType changes, clear cache) is done by
+    `schema_patch.apply_schema_changes`
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, site: str):
+        with self._lock:
+            entry = self._entries.get(site)
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(site)
+            entry.hits += 1
+            return entry.schema
+
+    def set(self, site: str, schema: GraphQLSchema, build_time: float = 0,
+            max_count: int = 0, max_bytes: int = 0):
+        """
+        Returns the list of sites whose schemas were evicted
+        """
+        entry = frappe._dict(
+            schema=schema,
+            build_time=build_time,
+            size=get_schema_size(schema),
+            hits=0,
+            builds=1,
+        )
+        with self._lock:
+            existing = self._entries.get(site)
+            if existing is not None:
+                entry.builds += existing.builds
+
+            self._entries[site] = entry
+            self._entries.move_to_end(site)
+            return self.evict(max_count=max_count, max_bytes=max_bytes)
+
+    def evict(self, max_count: int = 0, max_bytes: int = 0):
+        evicted = []
+        # The most recently used schema is always kept
+        while len(self._entries) > 1:
+            if max_count and len(self._entries) > max_count:
+                evicted.append(self._entries.popitem(last=False)[0])
+            elif max_bytes and sum(x.size for x in self._entries.values()) > max_bytes:
+                evicted.append(self._entries.popitem(last=False)[0])
+            else:
+                break
+
+        return evicted
+
+    def pop(self, site: str, default=None):
+        with self._lock:
+            entry = self._entries.pop(site, None)
+
+        return entry.schema if entry else default
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, site: str):
+        return site in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def info(self):
+        with self._lock:
+            sites = frappe._dict({
+                site: frappe._dict(
+                    size=entry.size,
+                    build_time=entry.build_time,
+                    hits=entry.hits,
+                    builds=entry.builds,
+                )
+                for site, entry in self._entries.items()
+            })
+
+        return frappe._dict(
+            count=len(sites),
+            size=sum(x.size for x in sites.values()),
+            sites=sites
+        )
+
+
+def get_schema_cache_size():
+    return cint(frappe.local.conf.get("frappe_graphql_schema_cache_size"))
+
+
+def get_schema_cache_max_bytes():
+    return int(flt(frappe.local.conf.get("frappe_graphql_schema_cache_max_mb")) * 1024 * 1024)
+
+
+def get_schema_size(schema: GraphQLSchema):
+    """
+    Approximate size of the schema in bytes: the types, fields, enum values & their AST nodes.
+    Resolvers & DocFields are counted by their own size only.
+    """
+    walked_types = (
+        GraphQLSchema, GraphQLNamedType, GraphQLField, GraphQLArgument, GraphQLInputField,
+        GraphQLEnumValue, GraphQLWrappingType, GraphQLDirective
+    )
+
+    size = 0
+    seen = set()
+    stack = [schema]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+        elif isinstance(obj, Node):
+            stack.extend(getattr(obj, key, None) for key in obj.keys)
+        elif isinstance(obj, walked_types):
+            stack.append(vars(obj))
+
+    return size
+
+
+def get_schema_registry_info():
+    from .loader import graphql_schemas
+    return graphql_schemas.info()
+
+
+@frappe.whitelist()
+def get_schema_stats():
+    """
+    Schemas held by the current worker, with their approximate size (bytes) & build time (s)
+    """
+    frappe.only_for("System Manager")
+    return get_schema_registry_info()
@@ -0,0 +1,101 @@
+import os
+import pickle
+import hashlib
+from typing import List, Optional, Tuple
+
+import graphql
+from graphql import DocumentNode
+
+import frappe
+from frappe.utils import cint
+
+"""
+Schema Snapshot
+
+Building the schema parses every SDL file of the site (doctype_sdls) & of the
+`graphql_sdl_dir` hooks. On large sites, this is a noticeable part of every worker boot.
+
+The parsed DocumentNode is pickled into the site folder along with a hash of all the
+SDL inputs. Workers load the snapshot when the hash matches & skip parsing altogether.
+Any change to the SDL files changes the hash, which triggers a full build & a new snapshot.
+
+Disable with the site config `frappe_graphql_disable_schema_snapshot: 1`
+"""
+
+SCHEMA_SNAPSHOT_FILE = "graphql_schema_snapshot.pickle"
+SCHEMA_SNAPSHOT_FORMAT = 1
+
+
+def is_schema_snapshot_enabled():
+    return not cint(frappe.local.conf.get("frappe_graphql_disable_schema_snapshot"))
+
+
+def get_schema_snapshot_path():
+    return frappe.get_site_path(SCHEMA_SNAPSHOT_FILE)
+
+
+def get_sources_hash(sources: List[Tuple[str, str]]):
+    """
+    sources: List of (path, sdl)
+    """
+    from frappe_graphql import __version__
+
+    h = hashlib.sha256()
+    h.update(frappe.safe_encode(
+        f"{SCHEMA_SNAPSHOT_FORMAT}|{graphql.version}|{__version__}"))
+    for path, sdl in sources:
+        h.update(b"\0")
+        h.update(frappe.safe_encode(path))
+        h.update(b"\0")
+        h.update(frappe.safe_encode(sdl))
+
+    return h.hexdigest()
+
+
+def load_schema_snapshot(sources_hash: str) -> Optional[DocumentNode]:
+    path = get_schema_snapshot_path()
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception:
+        # The SDL is parsed again & the snapshot rewritten
+        if frappe.conf.get("developer_mode"):
+            frappe.errprint(f"Unable to read GraphQL Schema Snapshot at {path}\n"
+                            + frappe.get_traceback())
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("sources_hash") != sources_hash:
+        return None
+
+    return snapshot.get("document")
+
+
+def save_schema_snapshot(sources_hash: str, document: DocumentNode):
+    path = get_schema_snapshot_path()
+    # Write to a temp file & rename, so that other workers never read a partial snapshot
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                dict(sources_hash=sources_hash, document=document),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, path)
+    except Exception:
+        frappe.log_error(
+            title="GraphQL Schema Snapshot",
+            message=f"Unable to write GraphQL Schema Snapshot to {path}\n"
+            + frappe.get_traceback()
+        )
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def clear_schema_snapshot():
+    path = get_schema_snapshot_path()
+    if os.path.exists(path):
+        os.remove(path)
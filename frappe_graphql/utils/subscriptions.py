@@ -1,5 +1,5 @@
 from datetime import timedelta
-from graphql import GraphQLResolveInfo, ExecutionContext, DocumentNode, GraphQLField, \
+from graphql import GraphQLResolveInfo, DocumentNode, GraphQLField, \
     FieldNode, GraphQLError, parse
 
 import frappe
@@ -7,6 +7,7 @@ from frappe.realtime import emit_via_redis
 from frappe.utils import now_datetime, get_datetime
 
 from frappe_graphql import get_schema
+from frappe_graphql.utils.execution import get_execution_context_class
 
 """
 Implemented similar to
@@ -181,7 +182,7 @@ def gql_transform(subscription, selection_set, obj):
     subscription_field_node = document.definitions[0].selection_set.selections[0]
     subscription_field_node.selection_set.selections = selection_set
 
-    exc_ctx = ExecutionContext.build(
+    exc_ctx = get_execution_context_class().build(
         schema=schema,
         document=document,
     )
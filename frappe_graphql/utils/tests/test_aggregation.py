@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import frappe
+
+from frappe_graphql.graphql import execute
+
+
+class TestAggregation(TestCase):
+    def test_group_by_count(self):
+        r = execute(query="""
+        query {
+            UsersAggregate(groupBy: ["enabled"], metrics: [{function: COUNT}]) {
+                group { field value }
+                metrics { function field value }
+            }
+        }
+        """)
+        self.assertIsNone(r.get("errors"))
+
+        groups = {
+            x.get("group")[0].get("value"): x.get("metrics")[0].get("value")
+            for x in r.get("data").get("UsersAggregate")
+        }
+        for enabled in (0, 1):
+            self.assertEqual(
+                groups.get(str(enabled), 0), frappe.db.count("User", dict(enabled=enabled)))
+
+    def test_metrics_without_group_by(self):
+        r = execute(query="""
+        query {
+            UsersAggregate(metrics: [{function: COUNT}, {function: SUM, field: "enabled"}]) {
+                metrics { function field value }
+            }
+        }
+        """)
+        self.assertIsNone(r.get("errors"))
+
+        metrics = r.get("data").get("UsersAggregate")[0].get("metrics")
+        self.assertEqual(metrics[0].get("value"), frappe.db.count("User"))
+        self.assertEqual(metrics[1].get("value"), frappe.db.count("User", dict(enabled=1)))
+
+    def test_invalid_fields(self):
+        for metrics in ('{function: SUM, field: "email"}', '{function: SUM, field: "1; drop"}'):
+            r = execute(query="""
+            query {
+                UsersAggregate(metrics: [%s]) { metrics { value } }
+            }
+            """ % metrics)
+            self.assertIsNotNone(r.get("errors"))
+
+    def test_limit(self):
+        r = execute(query="""
+        query {
+            UsersAggregate(groupBy: ["name"], metrics: [{function: COUNT}], limit: 1) {
+                group { value }
+            }
+        }
+        """)
+        self.assertIsNone(r.get("errors"))
+        self.assertEqual(len(r.get("data").get("UsersAggregate")), 1)
+
+        for limit in (0, 100000):
+            r = execute(query="""
+            query {
+                UsersAggregate(metrics: [{function: COUNT}], limit: %s) { metrics { value } }
+            }
+            """ % limit)
+            self.assertIsNotNone(r.get("errors"))
@@ -0,0 +1,58 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+import graphql
+
+from frappe_graphql import api
+
+
+class TestAPI(TestCase):
+    def tearDown(self) -> None:
+        frappe.local.response = frappe._dict()
+
+    def execute_gql_query(self, query, variables=None, operation_name=None):
+        with patch.object(api, "get_query", return_value=(query, variables, operation_name)):
+            api.execute_gql_query()
+
+        return frappe.local.response
+
+    def test_missing_query(self):
+        response = self.execute_gql_query(None)
+        self.assertEqual(response.get("http_status_code"), 400)
+        self.assertEqual(response.get("errors")[0].get("message"), "Must provide query string")
+
+    def test_query_is_parsed_once(self):
+        # Unique query text, so that the document cache is not hit
+        query = f"""
+        # {frappe.generate_hash()}
+        query GetAdmin($password: Password) {{
+            User(name: "Administrator") {{
+                name
+            }}
+        }}
+        """
+
+        with patch("frappe_graphql.utils.execution.parse", wraps=graphql.parse) as parse, \
+                patch("frappe_graphql.utils.http.parse", wraps=graphql.parse) as http_parse, \
+                patch.object(api, "get_masked_variables",
+                             wraps=api.get_masked_variables) as get_masked_variables, \
+                patch.object(api, "get_operation_name",
+                             wraps=api.get_operation_name) as get_operation_name:
+            # $password is never used: fails validation & gets logged
+            response = self.execute_gql_query(query, variables={"password": "secret"})
+
+        self.assertTrue(len(response.get("errors")))
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(http_parse.call_count, 0)
+
+        # Masked variables & operation name are worked out from the shared document
+        document = get_masked_variables.call_args.kwargs.get("document")
+        self.assertIsNotNone(document)
+        self.assertIs(get_operation_name.call_args.kwargs.get("document"), document)
+        with patch("frappe_graphql.utils.http.parse") as http_parse:
+            self.assertEqual(
+                api.get_masked_variables(query, {"password": "secret"}, document=document),
+                {"password": "******"})
+            self.assertEqual(api.get_operation_name(query, None, document=document), "GetAdmin")
+        self.assertFalse(http_parse.called)
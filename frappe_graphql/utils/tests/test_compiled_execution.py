@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+import frappe
+
+from frappe_graphql.graphql import execute
+from frappe_graphql.utils.execution.compiler import compiled_operations
+
+USERS_QUERY = """
+query GetUsers {
+    Users(first: 5) {
+        edges {
+            node {
+                name
+                full_name
+                enabled
+                user_type__name
+                roles {
+                    role__name
+                }
+            }
+        }
+    }
+    User(name: "Administrator") {
+        name
+        email
+        __typename
+    }
+}
+"""
+
+
+class TestCompiledExecution(TestCase):
+    def tearDown(self) -> None:
+        frappe.local.conf.pop("frappe_graphql_compiled_execution", None)
+
+    def test_same_output_as_regular_execution(self):
+        expected = execute(query=USERS_QUERY)
+        self.assertIsNone(expected.get("errors"))
+
+        frappe.local.conf.frappe_graphql_compiled_execution = 1
+        # Second run reuses the compiled fields
+        for _ in range(2):
+            r = execute(query=USERS_QUERY)
+            self.assertEqual(r, expected)
+
+        self.assertTrue(len(compiled_operations))
+
+    def test_typename(self):
+        frappe.local.conf.frappe_graphql_compiled_execution = 1
+        r = execute(query="""
+        query {
+            User(name: "Administrator") {
+                name
+                __typename
+            }
+        }
+        """)
+        self.assertIsNone(r.get("errors"))
+        self.assertEqual(r.get("data").get("User").get("__typename"), "User")
@@ -0,0 +1,183 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql.graphql import execute
+from frappe_graphql.utils.cursor_pagination import CursorPaginator, encode_cursor, decode_cursor
+
+
+class TestCursorPagination(TestCase):
+    def test_count_skipped_when_not_requested(self):
+        with patch.object(CursorPaginator, "get_count") as get_count:
+            r = execute(query="""
+            query {
+                Users(first: 2) { edges { node { name } } }
+            }
+            """)
+
+        self.assertIsNone(r.get("errors"))
+        get_count.assert_not_called()
+
+    def test_exact_count(self):
+        r = execute(query="""
+        query {
+            Users(first: 2) { totalCount edges { node { name } } }
+        }
+        """)
+        self.assertIsNone(r.get("errors"))
+        self.assertGreaterEqual(r.get("data").get("Users").get("totalCount"), 2)
+
+    def test_approximate_count(self):
+        r = execute(query="""
+        query {
+            Users(first: 2, countMode: APPROXIMATE) { totalCount edges { node { name } } }
+        }
+        """)
+        self.assertIsNone(r.get("errors"))
+        self.assertIsInstance(r.get("data").get("Users").get("totalCount"), int)
+
+    def test_cached_count(self):
+        frappe.local.conf.frappe_graphql_count_cache_ttl = 60
+        query = """
+        query {
+            Users(first: 2) { totalCount edges { node { name } } }
+        }
+        """
+
+        def _execute():
+            with patch.object(CursorPaginator, "resolve_count",
+                              autospec=True, side_effect=CursorPaginator.resolve_count) as count:
+                r = execute(query=query)
+            self.assertIsNone(r.get("errors"))
+            return count.call_count
+
+        try:
+            _execute()
+            # Counted once across pages
+            self.assertEqual(_execute(), 0)
+
+            # Invalidated on writes
+            frappe.get_doc("User", "Administrator").save(ignore_permissions=True)
+            self.assertEqual(_execute(), 1)
+        finally:
+            frappe.local.conf.pop("frappe_graphql_count_cache_ttl", None)
+
+    def test_pages_with_tiebreaker(self):
+        query = """
+        query Users($after: String) {
+            Users(first: 1, after: $after, sortBy: {field: MODIFIED, direction: DESC}) {
+                pageInfo { hasNextPage endCursor }
+                edges { node { name } }
+            }
+        }
+        """
+        names = []
+        after = None
+        while True:
+            r = execute(query=query, variables=dict(after=after))
+            self.assertIsNone(r.get("errors"))
+            users = r.get("data").get("Users")
+            names.extend(x.get("node").get("name") for x in users.get("edges"))
+            if not users.get("pageInfo").get("hasNextPage"):
+                break
+            after = users.get("pageInfo").get("endCursor")
+
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(set(names), set(frappe.get_all("User", pluck="name")))
+
+    def test_row_value_cursor_filter(self):
+        paginator = CursorPaginator(doctype="User")
+        paginator.sorting_fields = ["modified", "name"]
+        paginator.original_sort_dir = "desc"
+        paginator.has_tiebreaker = True
+        paginator.after = paginator.cursor = paginator.to_cursor(
+            frappe._dict(modified="2021-01-01 00:00:00", name="Guest"), paginator.sorting_fields)
+
+        self.assertTrue(paginator.get_cursor_filter().startswith(
+            "(`tabUser`.modified, `tabUser`.name) < ("))
+
+    def test_cursor_encoding(self):
+        values = [
+            None, 1, 2.5, datetime(2021, 2, 13, 23, 23, 55, 278023), Decimal("1.20"), "Guest"
+        ]
+        cursor = encode_cursor(values)
+        self.assertEqual(decode_cursor(cursor), values)
+        self.assertNotIn("=", cursor)
+
+        # Cursors issued before
+        legacy_cursor = base64.b64encode(json.dumps(["2021-02-13 23:23:55.278023"], indent=1)
+                                         .encode("utf-8")).decode()
+        self.assertEqual(decode_cursor(legacy_cursor), ["2021-02-13 23:23:55.278023"])
+
+        self.assertRaises(frappe.ValidationError, decode_cursor, "AVMAAAAK")
+
+    def test_edge_cursors_generated_when_selected(self):
+        query = """
+        query {
+            Users(first: 2) { pageInfo { endCursor } edges { %s node { name } } }
+        }
+        """
+        with patch.object(CursorPaginator, "to_cursor", autospec=True,
+                          side_effect=CursorPaginator.to_cursor) as to_cursor:
+            r = execute(query=query % "")
+        self.assertIsNone(r.get("errors"))
+        # start & end cursors only
+        self.assertEqual(to_cursor.call_count, 2)
+
+        r = execute(query=query % "cursor")
+        self.assertIsNone(r.get("errors"))
+        users = r.get("data").get("Users")
+        self.assertEqual(
+            users.get("edges")[-1].get("cursor"), users.get("pageInfo").get("endCursor"))
+
+    def test_batched_connections(self):
+        paginator = CursorPaginator(doctype="User", link_field="owner")
+        paginator.resolve_kwargs = dict(first=1)
+        paginator.first, paginator.last, paginator.cursor = 1, None, None
+        paginator.filters = []
+        paginator.sorting_fields, paginator.has_tiebreaker = ["modified", "name"], True
+        paginator.sort_dir = paginator.original_sort_dir = "desc"
+
+        with patch.object(CursorPaginator, "is_total_count_requested", return_value=True), \
+                patch.object(CursorPaginator, "is_edge_cursor_requested", return_value=True), \
+                patch.object(CursorPaginator, "get_fields_to_fetch",
+                             return_value=["name", "modified"]):
+            connections = paginator.resolve_batch(["Administrator", "Guest", "-"])
+
+        for owner, connection in zip(["Administrator", "Guest", "-"], connections):
+            users = frappe.get_all(
+                "User", filters=dict(owner=owner), order_by="modified desc, name desc",
+                pluck="name")
+            self.assertEqual(connection.totalCount, len(users))
+            self.assertEqual([x.node.name for x in connection.edges], users[:1])
+            self.assertEqual(connection.pageInfo.hasNextPage, len(users) > 1)
+
+    def test_batched_loader_per_paginator_options(self):
+        def get_loader(**kwargs):
+            paginator = CursorPaginator(doctype="User", link_field="owner", **kwargs)
+            paginator.resolve_kwargs = dict(first=1)
+            paginator.resolve_info = None
+            return paginator.get_batched_loader()
+
+        with patch("frappe_graphql.utils.cursor_pagination.get_info_path_key",
+                   return_value="Users-edges-node-users"):
+            loader = get_loader()
+            self.assertIs(get_loader(), loader)
+            self.assertIsNot(get_loader(filters=[["enabled", "=", 1]]), loader)
+            self.assertIsNot(get_loader(default_sorting_fields=["creation"]), loader)
+            self.assertIsNot(get_loader(count_mode="APPROXIMATE"), loader)
+
+    def test_row_value_comparison_only_on_not_null_columns(self):
+        paginator = CursorPaginator(doctype="User")
+        self.assertTrue(paginator.is_not_null_keyset(["name"], ["Administrator"]))
+        self.assertTrue(paginator.is_not_null_keyset(["enabled", "name"], [1, "Administrator"]))
+
+        # Nullable in the DDL
+        for fieldname in ("creation", "modified", "owner", "modified_by"):
+            self.assertFalse(
+                paginator.is_not_null_keyset([fieldname, "name"], ["x", "Administrator"]))
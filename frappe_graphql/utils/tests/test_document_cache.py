@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import frappe
+
+from frappe_graphql import get_schema
+from frappe_graphql.utils.execution import parse_and_validate
+from frappe_graphql.utils.execution.document_cache import document_cache, \
+    get_document_cache_info
+
+
+class TestDocumentCache(TestCase):
+    def setUp(self) -> None:
+        document_cache.clear()
+
+    def tearDown(self) -> None:
+        document_cache.clear()
+        frappe.local.conf.pop("frappe_graphql_document_cache_size", None)
+
+    def test_repeat_query_is_served_from_cache(self):
+        schema = get_schema()
+        query = "query Ping { ping }"
+
+        document, errors = parse_and_validate(schema=schema, query=query)
+        self.assertEqual(errors, [])
+
+        info = get_document_cache_info()
+        _document, _errors = parse_and_validate(schema=schema, query=query)
+        self.assertIs(_document, document)
+        self.assertEqual(get_document_cache_info().hits, info.hits + 1)
+
+    def test_validation_errors_are_cached(self):
+        schema = get_schema()
+        query = "query Ping { unknown_field }"
+
+        document, errors = parse_and_validate(schema=schema, query=query)
+        self.assertEqual(len(errors), 1)
+
+        _document, _errors = parse_and_validate(schema=schema, query=query)
+        self.assertIs(_document, document)
+        self.assertEqual(_errors, errors)
+
+    def test_syntax_errors(self):
+        document, errors = parse_and_validate(schema=get_schema(), query="query {")
+        self.assertIsNone(document)
+        self.assertEqual(len(errors), 1)
+
+    def test_lru_bound(self):
+        frappe.local.conf.frappe_graphql_document_cache_size = 2
+        schema = get_schema()
+
+        for alias in ("a", "b", "c"):
+            parse_and_validate(schema=schema, query=f"query {{ {alias}: ping }}")
+
+        self.assertEqual(get_document_cache_info().size, 2)
+
+    def test_subscriptions_are_not_cached(self):
+        parse_and_validate(
+            schema=get_schema(),
+            query="subscription { doc_events { subscription_id } }")
+        self.assertEqual(get_document_cache_info().size, 0)
@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+import frappe
+
+from frappe_graphql.utils.export import get_export_query, iterate_rows
+
+
+class TestExport(TestCase):
+    def test_export_rows(self):
+        query = get_export_query(
+            "User",
+            fields=["name", "enabled"],
+            filters=[{"fieldname": "enabled", "operator": "EQ", "value": "1"}],
+            sort_by={"field": "NAME", "direction": "ASC"}
+        )
+        rows = list(iterate_rows(query))
+
+        self.assertEqual(
+            [x.get("name") for x in rows],
+            frappe.get_all("User", filters=dict(enabled=1), order_by="name asc", pluck="name")
+        )
+        self.assertEqual(set(rows[0].keys()), {"name", "enabled"})
+
+    def test_invalid_fields(self):
+        self.assertRaises(frappe.ValidationError, get_export_query, "User", fields=["1; drop"])
+        self.assertRaises(
+            frappe.ValidationError, get_export_query, "User", sort_by={"field": "1; drop"})
@@ -0,0 +1,72 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql import get_schema
+from frappe_graphql.graphql import execute, execute_plan
+from frappe_graphql.utils.execution import get_execution_plan
+from frappe_graphql.utils.execution.persisted_operations import get_persisted_operation, \
+    clear_persisted_operations_registry
+
+GET_ADMIN_QUERY = """
+query GetAdmin {
+    User(name: "Administrator") {
+        name
+        full_name
+        roles {
+            role__name
+        }
+    }
+}
+"""
+
+
+class TestPersistedOperations(TestCase):
+    def setUp(self) -> None:
+        clear_persisted_operations_registry()
+        self.load_patcher = patch(
+            "frappe_graphql.utils.execution.persisted_operations.load_persisted_operations",
+            return_value={"get-admin": GET_ADMIN_QUERY}
+        )
+        self.load_patcher.start()
+
+    def tearDown(self) -> None:
+        self.load_patcher.stop()
+        clear_persisted_operations_registry()
+
+    def test_registered_operation_is_precompiled(self):
+        plan = get_persisted_operation(schema=get_schema(), operation_id="get-admin")
+        self.assertTrue(plan.persisted)
+        self.assertEqual(plan.errors, [])
+
+        operation_trees = list(plan.field_trees.values())[0]
+        self.assertEqual(
+            operation_trees.get("User"),
+            {"name": {}, "full_name": {}, "roles": {"role__name": {}}}
+        )
+        self.assertEqual(operation_trees.get("User-roles"), {"role__name": {}})
+
+    def test_query_text_resolves_to_registered_operation(self):
+        plan = get_execution_plan(schema=get_schema(), query=GET_ADMIN_QUERY)
+        self.assertTrue(plan.persisted)
+        self.assertEqual(plan.operation_id, "get-admin")
+
+    def test_execute_registered_operation(self):
+        plan = get_persisted_operation(schema=get_schema(), operation_id="get-admin")
+        r = execute_plan(plan=plan)
+        self.assertIsNone(r.get("errors"))
+        self.assertEqual(r.get("data").get("User").get("name"), "Administrator")
+
+    def test_execute_enforces_persisted_operations_only(self):
+        frappe.local.conf.frappe_graphql_persisted_operations_only = 1
+        try:
+            r = execute(query="""{ User(name: "Administrator") { name } }""")
+            self.assertEqual(
+                r.get("errors")[0].extensions.get("code"), "PERSISTED_OPERATION_NOT_ALLOWED")
+            self.assertIsNone(r.get("data"))
+
+            r = execute(query=GET_ADMIN_QUERY)
+            self.assertIsNone(r.get("errors"))
+        finally:
+            frappe.local.conf.pop("frappe_graphql_persisted_operations_only", None)
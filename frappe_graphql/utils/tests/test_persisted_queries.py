@@ -0,0 +1,91 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql.utils.persisted_queries import resolve_persisted_query, get_query_hash, \
+    get_apq_redis_key, PersistedQueryNotFound, PersistedQueryHashMismatch, \
+    PersistedQueryNotSupported
+
+ADMIN_QUERY = """
+query GetAdmin {
+    User(name: "Administrator") {
+        name
+        full_name
+    }
+}
+"""
+
+
+class TestPersistedQueries(TestCase):
+    def setUp(self) -> None:
+        self.query_hash = get_query_hash(ADMIN_QUERY)
+        frappe.cache().delete_value(get_apq_redis_key(self.query_hash))
+
+    def tearDown(self) -> None:
+        frappe.cache().delete_value(get_apq_redis_key(self.query_hash))
+
+    def get_extensions(self, sha256_hash=None, version=1):
+        return {
+            "persistedQuery": {
+                "version": version,
+                "sha256Hash": sha256_hash or self.query_hash
+            }
+        }
+
+    def test_query_without_extensions(self):
+        self.assertEqual(resolve_persisted_query(ADMIN_QUERY, None), ADMIN_QUERY)
+
+    def test_unknown_hash(self):
+        with self.assertRaises(PersistedQueryNotFound):
+            resolve_persisted_query(None, self.get_extensions())
+
+    def test_invalid_hash(self):
+        with self.assertRaises(PersistedQueryNotFound):
+            resolve_persisted_query(None, self.get_extensions(sha256_hash="not-a-hash"))
+
+    def test_unsupported_version(self):
+        with self.assertRaises(PersistedQueryNotSupported):
+            resolve_persisted_query(ADMIN_QUERY, self.get_extensions(version=2))
+
+    def test_register_query(self):
+        self.assertEqual(resolve_persisted_query(ADMIN_QUERY, self.get_extensions()), ADMIN_QUERY)
+
+        # Hash alone resolves to the registered query
+        self.assertEqual(resolve_persisted_query(None, self.get_extensions()), ADMIN_QUERY)
+
+    def test_extensions_as_json(self):
+        resolve_persisted_query(ADMIN_QUERY, frappe.as_json(self.get_extensions()))
+        self.assertEqual(
+            resolve_persisted_query(None, frappe.as_json(self.get_extensions())), ADMIN_QUERY)
+
+    def test_hash_mismatch(self):
+        with self.assertRaises(PersistedQueryHashMismatch):
+            resolve_persisted_query(
+                ADMIN_QUERY, self.get_extensions(sha256_hash=get_query_hash("{ a }")))
+
+        with self.assertRaises(PersistedQueryNotFound):
+            resolve_persisted_query(None, self.get_extensions())
+
+    def test_invalid_query_is_not_registered(self):
+        query = "{ UnknownField }"
+        extensions = self.get_extensions(sha256_hash=get_query_hash(query))
+        try:
+            # Executed as is, so that the validation errors are returned
+            self.assertEqual(resolve_persisted_query(query, extensions), query)
+
+            with self.assertRaises(PersistedQueryNotFound):
+                resolve_persisted_query(None, extensions)
+        finally:
+            frappe.cache().delete_value(get_apq_redis_key(get_query_hash(query)))
+
+    def test_large_query_is_not_registered(self):
+        with patch(
+            "frappe_graphql.utils.persisted_queries.get_apq_max_query_size",
+            return_value=len(ADMIN_QUERY) - 1
+        ):
+            self.assertEqual(
+                resolve_persisted_query(ADMIN_QUERY, self.get_extensions()), ADMIN_QUERY)
+
+        with self.assertRaises(PersistedQueryNotFound):
+            resolve_persisted_query(None, self.get_extensions())
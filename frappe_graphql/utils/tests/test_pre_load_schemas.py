@@ -0,0 +1,69 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import frappe
+
+from frappe_graphql.utils import pre_load_schemas as pre_load
+
+
+class InProcessExecutor:
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def map(self, fn, iterable):
+        return map(fn, iterable)
+
+
+class TestPreLoadSchemas(TestCase):
+    def pre_load(self, sites, snapshot_enabled=True, max_schemas=0):
+        options = frappe._dict(
+            sites=sites, snapshot_enabled=snapshot_enabled, max_schemas=max_schemas)
+
+        with patch.object(pre_load, "get_pre_load_options", return_value=options), \
+                patch.object(pre_load, "ProcessPoolExecutor") as executor, \
+                patch.object(pre_load, "warm_site_schema_snapshot",
+                             side_effect=lambda site: dict(site=site, status="ok")) as warm, \
+                patch.object(pre_load, "load_site_schema",
+                             return_value=dict(status="ok")) as load, \
+                patch.object(pre_load, "log_pre_load_report"):
+            executor.side_effect = InProcessExecutor
+            report = pre_load.pre_load_schemas()
+
+        return report, executor, warm, load
+
+    def test_pre_load(self):
+        report, executor, warm, load = self.pre_load(["a", "b"])
+        self.assertEqual(executor.call_count, 1)
+        self.assertEqual([x.args[0] for x in warm.call_args_list], ["a", "b"])
+        self.assertEqual([x.args[0] for x in load.call_args_list], ["a", "b"])
+        self.assertTrue(all(x.get("status") == "ok" for x in report.values()))
+
+    def test_pool_skipped_without_snapshots(self):
+        report, executor, warm, load = self.pre_load(["a", "b"], snapshot_enabled=False)
+        self.assertFalse(executor.called)
+        self.assertFalse(warm.called)
+        self.assertEqual([x.args[0] for x in load.call_args_list], ["a", "b"])
+
+    def test_capped_at_schema_cache_size(self):
+        report, executor, warm, load = self.pre_load(["a", "b", "c"], max_schemas=2)
+        self.assertEqual([x.args[0] for x in warm.call_args_list], ["a", "b"])
+        self.assertEqual([x.args[0] for x in load.call_args_list], ["a", "b"])
+        self.assertEqual(report["c"].get("status"), "skipped")
+
+    def test_report_is_logged(self):
+        report = [
+            dict(site="a", status="ok", warmup_time=0.1, load_time=0.2),
+            dict(site="b", status="failed", error="Traceback"),
+        ]
+        with patch.object(frappe, "logger") as logger, patch("builtins.print") as _print:
+            pre_load.log_pre_load_report(report, warmup_time=0.5)
+
+        self.assertFalse(_print.called)
+        self.assertIn("1 loaded, 1 failed", logger.return_value.info.call_args.args[0])
+        self.assertIn("Traceback", logger.return_value.error.call_args.args[0])
@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+import frappe
+from graphql import GraphQLField, GraphQLString, parse
+
+from frappe_graphql import get_schema
+from frappe_graphql.graphql import execute
+from frappe_graphql.utils.loader import graphql_schemas
+from frappe_graphql.utils.schema_patch import patch_doctype_type
+
+CUSTOM_FIELDNAME = "graphql_patch_test_field"
+
+
+class TestSchemaPatch(TestCase):
+    def setUp(self) -> None:
+        graphql_schemas.pop(frappe.local.site, None)
+
+    def tearDown(self) -> None:
+        self.remove_custom_field()
+        graphql_schemas.pop(frappe.local.site, None)
+
+    def test_custom_field_is_patched_in(self):
+        schema = get_schema()
+        role_type = schema.get_type("Role")
+        role_name_field = role_type.fields["role_name"]
+
+        self.add_custom_field()
+        self.assertTrue(patch_doctype_type(schema, "Role"))
+        self.assertIs(schema.get_type("Role"), role_type)
+        self.assertIn(CUSTOM_FIELDNAME, role_type.fields)
+        # Unchanged fields are left as is
+        self.assertIs(role_type.fields["role_name"], role_name_field)
+
+        r = execute(query=f"""
+        query {{
+            Role(name: "System Manager") {{
+                name
+                {CUSTOM_FIELDNAME}
+            }}
+        }}
+        """)
+        self.assertIsNone(r.get("errors"))
+        self.assertIn(CUSTOM_FIELDNAME, r.get("data").get("Role"))
+
+    def test_removed_field_is_dropped(self):
+        schema = get_schema()
+
+        self.add_custom_field()
+        self.assertTrue(patch_doctype_type(schema, "Role"))
+        self.assertIn(CUSTOM_FIELDNAME, schema.get_type("Role").fields)
+
+        self.remove_custom_field()
+        self.assertTrue(patch_doctype_type(schema, "Role"))
+        self.assertNotIn(CUSTOM_FIELDNAME, schema.get_type("Role").fields)
+
+    def test_extension_fields_are_kept(self):
+        schema = get_schema()
+        role_type = schema.get_type("Role")
+
+        # As added by another app via `extend type Role`
+        extension_node = parse("extend type Role { graphql_extension_field: String }")
+        role_type.fields["graphql_extension_field"] = GraphQLField(
+            GraphQLString, ast_node=extension_node.definitions[0].fields[0])
+
+        self.add_custom_field()
+        self.assertTrue(patch_doctype_type(schema, "Role"))
+        self.assertIn(CUSTOM_FIELDNAME, role_type.fields)
+        self.assertIn("graphql_extension_field", role_type.fields)
+
+    def test_new_fields_get_their_args(self):
+        schema = get_schema()
+        user_type = schema.get_type("User")
+        user_type.fields.pop("roles")
+
+        self.assertTrue(patch_doctype_type(schema, "User"))
+        self.assertIn("roles", user_type.fields)
+        self.assertTrue({"first", "after", "filter", "sortBy"}.issubset(
+            set(user_type.fields["roles"].args)))
+
+    def add_custom_field(self):
+        frappe.get_doc(dict(
+            doctype="Custom Field",
+            dt="Role",
+            fieldname=CUSTOM_FIELDNAME,
+            label="GraphQL Patch Test Field",
+            fieldtype="Data",
+        )).insert(ignore_permissions=True)
+        frappe.clear_cache(doctype="Role")
+
+    def remove_custom_field(self):
+        name = frappe.db.get_value("Custom Field", {"dt": "Role", "fieldname": CUSTOM_FIELDNAME})
+        if not name:
+            return
+
+        frappe.delete_doc("Custom Field", name, ignore_permissions=True)
+        frappe.clear_cache(doctype="Role")
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from graphql import build_schema
+
+from frappe_graphql import get_schema
+from frappe_graphql.utils.schema_patch import bump_schema_version
+from frappe_graphql.utils.schema_registry import SchemaRegistry, get_schema_size
+
+
+def make_schema(n_fields=1):
+    fields = "\n".join([f"f{i}: String" for i in range(n_fields)])
+    return build_schema(f"type Query {{ {fields} }}")
+
+
+class TestSchemaRegistry(TestCase):
+    def test_lru_count(self):
+        registry = SchemaRegistry()
+        for site in ("a", "b", "c"):
+            registry.set(site, make_schema(), max_count=2)
+
+        self.assertNotIn("a", registry)
+        self.assertEqual(len(registry), 2)
+
+        registry.get("b")
+        evicted = registry.set("d", make_schema(), max_count=2)
+        self.assertEqual(evicted, ["c"])
+        self.assertIn("b", registry)
+
+    def test_lru_bytes(self):
+        registry = SchemaRegistry()
+        schema = make_schema(50)
+        max_bytes = int(get_schema_size(schema) * 1.5)
+
+        registry.set("a", schema, max_bytes=max_bytes)
+        registry.set("b", make_schema(50), max_bytes=max_bytes)
+        self.assertNotIn("a", registry)
+        self.assertIn("b", registry)
+
+    def test_info(self):
+        registry = SchemaRegistry()
+        registry.set("a", make_schema(), build_time=0.5)
+        registry.get("a")
+
+        info = registry.info()
+        self.assertEqual(info.count, 1)
+        self.assertEqual(info.sites.a.build_time, 0.5)
+        self.assertEqual(info.sites.a.hits, 1)
+        self.assertGreater(info.sites.a.size, 0)
+
+    def test_version_bump_rebuilds_schema(self):
+        schema = get_schema()
+        self.assertIs(get_schema(), schema)
+
+        bump_schema_version()
+        self.assertIsNot(get_schema(), schema)
+
+    def test_doctype_change_patches_schema(self):
+        schema = get_schema()
+        bump_schema_version(doctype="Role")
+        self.assertIs(get_schema(), schema)
@@ -0,0 +1,41 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from graphql import build_ast_schema, print_schema
+
+from frappe_graphql.utils.loader import get_typedefs, get_typedefs_document, \
+    get_typedef_sources
+from frappe_graphql.utils.schema_snapshot import get_sources_hash, load_schema_snapshot, \
+    clear_schema_snapshot
+
+
+class TestSchemaSnapshot(TestCase):
+    def setUp(self) -> None:
+        clear_schema_snapshot()
+
+    def tearDown(self) -> None:
+        clear_schema_snapshot()
+
+    def test_snapshot_is_reused(self):
+        document = get_typedefs_document()
+        sources_hash = get_sources_hash(get_typedef_sources())
+        self.assertIsNotNone(load_schema_snapshot(sources_hash))
+
+        with patch("frappe_graphql.utils.loader.parse") as parse:
+            snapshot_document = get_typedefs_document()
+            parse.assert_not_called()
+
+        self.assertEqual(
+            print_schema(build_ast_schema(snapshot_document)),
+            print_schema(build_ast_schema(document))
+        )
+
+    def test_changed_sources_invalidate_snapshot(self):
+        get_typedefs_document()
+        sources = get_typedef_sources()
+        sources.append(("/tmp/new.graphql", "type NewType { name: String }"))
+
+        self.assertIsNone(load_schema_snapshot(get_sources_hash(sources)))
+
+    def test_typedefs(self):
+        self.assertIn("type User", get_typedefs())